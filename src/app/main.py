@@ -5,6 +5,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.config import config
+from utils.session import prewarm_pipeline, new_chat_history
 from components.sidebar import render_sidebar as render_config_sidebar
 from tabs.ingestion_tab import render_ingestion_tab
 from tabs.chatbot_tab import render_chatbot_tab
@@ -49,13 +50,14 @@ config.setup_logging()
 
 def init_session_state():
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = new_chat_history()
     if 'ingestion_stats' not in st.session_state:
         st.session_state.ingestion_stats = {'success': 0, 'failed': 0}
     if 'metrics_loaded' not in st.session_state:
         st.session_state.metrics_loaded = False
     if 'current_tab' not in st.session_state:
         st.session_state.current_tab = None
+    prewarm_pipeline()
 
 def render_sidebar():
     chunk_size, chunk_overlap = render_config_sidebar()
@@ -6,6 +6,8 @@ from datetime import datetime
 import logging
 import os
 
+from utils.session import new_chat_history
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -84,7 +86,7 @@ def render_chatbot_tab():
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("🗑️ Clear", disabled=st.session_state.is_processing):
-            st.session_state.chat_history = []
+            st.session_state.chat_history.clear()
             st.rerun()
 
 def init_session_state():
@@ -93,12 +95,13 @@ def init_session_state():
         'processing_start_time': None,
         'suggested_questions': [],
         'questions_loaded': False,
-        'chat_history': [],
         'pending_query': None
     }
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
+    if 'chat_history' not in st.session_state:
+        st.session_state.chat_history = new_chat_history()
 
 def render_api_config():
     col1, col2 = st.columns(2)
@@ -4,7 +4,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from utils.ingestion_helper import ingest_documents
+from utils.ingestion_helper import ingest_documents, get_system_metrics
 
 
 def render_ingestion_tab():
@@ -73,6 +73,7 @@ def _handle_file_processing(uploaded_files):
             # Clear metrics cache to force refresh
             if 'metrics_data' in st.session_state:
                 st.session_state.metrics_data = None
+            get_system_metrics.clear()
         
         # Process documents with progress feedback
         with st.spinner("Processing documents..."):
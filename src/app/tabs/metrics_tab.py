@@ -205,6 +205,7 @@ def _handle_system_reset():
         if result.get('status') == 'success':
             st.success("System reset successfully!")
             st.session_state.ingestion_stats = {'success': 0, 'failed': 0}
+            get_system_metrics.clear()
             if 'metrics_data' in st.session_state:
                 del st.session_state.metrics_data
             st.session_state['show_reset_confirm'] = False
@@ -1,14 +1,82 @@
 import streamlit as st
 from pathlib import Path
 import tempfile
+import hashlib
+import shutil
 from typing import List, Dict
 import logging
 import asyncio
+import time
 
 from ingestion.core import create_ingestion_pipeline
+from ingestion.core.cache import get_cached, put_cached
 
 logger = logging.getLogger(__name__)
 
+METRICS_TTL_SECONDS = 10
+
+
+class HashingWriter:
+    """File wrapper that hashes bytes as they are copied through it."""
+    
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.hasher = hashlib.blake2b(digest_size=16)
+    
+    def write(self, data):
+        self.hasher.update(data)
+        return self.fileobj.write(data)
+    
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+
+class IngestionProgress:
+    """
+    Coalesces per-file progress updates so the frontend receives one batch of
+    widget updates per flush interval instead of three per file.
+    """
+    
+    def __init__(self, total: int, flush_interval: float = 0.1):
+        self.total = total
+        self.flush_interval = flush_interval
+        self.done = 0
+        self.last_flush = time.monotonic()
+        self.lines = []
+        self.progress_bar = st.progress(0)
+        self.status_text = st.empty()
+        self.container = st.empty()
+    
+    def tick(self, ok: bool, message: str):
+        self.done += 1
+        self.lines.append(f"✅ {message}" if ok else f"❌ {message}")
+        now = time.monotonic()
+        if now - self.last_flush > self.flush_interval or self.done == self.total:
+            self._flush(now)
+    
+    def _flush(self, now: float):
+        self.last_flush = now
+        self.progress_bar.progress(self.done / self.total)
+        self.status_text.text(f"Processed {self.done}/{self.total} files")
+        self.container.markdown("  \n".join(self.lines))
+
+
+def run_pipeline(pipeline, coro):
+    """Run a pipeline coroutine on a fresh event loop, releasing the loop-bound async clients afterwards"""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await pipeline.aclose()
+    
+    return asyncio.run(main())
+
+
+@st.cache_resource(show_spinner=False)
+def get_ingestion_pipeline():
+    """Build the ingestion pipeline once per process and share it across reruns."""
+    return create_ingestion_pipeline()
+
 
 def ingest_documents(uploaded_files: List, update_stats_callback=None):
     """
@@ -19,49 +87,65 @@ def ingest_documents(uploaded_files: List, update_stats_callback=None):
         update_stats_callback: Optional callback function to update stats (success_count, failed_count)
     """
     try:
-        pipeline = create_ingestion_pipeline()
+        pipeline = get_ingestion_pipeline()
         
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        progress = IngestionProgress(len(uploaded_files))
         
         success_count = 0
         failed_count = 0
         
-        for idx, uploaded_file in enumerate(uploaded_files):
-            original_filename = uploaded_file.name
-            status_text.text(f"Processing: {original_filename}")
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=Path(original_filename).suffix) as tmp_file:
-                tmp_file.write(uploaded_file.read())
-                tmp_file_path = tmp_file.name
-            
-            try:
-                # Pass original filename as metadata
-                metadata = {'original_filename': original_filename}
-                result = asyncio.run(pipeline.ingest_document(
-                    str(tmp_file_path),
-                    metadata=metadata
-                ))
+        def record(filename, result):
+            nonlocal success_count, failed_count
+            if result:
+                success_count += 1
+                category = result.get('category_id', 'unknown')
+                progress.tick(ok=True, message=f"{filename} → {category}")
+            else:
+                failed_count += 1
+                progress.tick(ok=False, message=f"{filename} failed")
+        
+        pending = []
+        try:
+            for uploaded_file in uploaded_files:
+                original_filename = uploaded_file.name
+                
+                with tempfile.NamedTemporaryFile(delete=False, suffix=Path(original_filename).suffix) as tmp_file:
+                    writer = HashingWriter(tmp_file)
+                    uploaded_file.seek(0)
+                    shutil.copyfileobj(uploaded_file, writer)
+                    tmp_file_path = tmp_file.name
                 
-                if result:
-                    success_count += 1
-                    category = result.get('category_id', 'unknown')
-                    st.success(f"✅ {original_filename} → {category}")
+                content_hash = writer.hexdigest()
+                cached = get_cached(content_hash)
+                if cached:
+                    logger.info(f"Cache hit for {original_filename} ({content_hash}), skipping pipeline")
+                    Path(tmp_file_path).unlink(missing_ok=True)
+                    record(original_filename, cached)
                 else:
-                    failed_count += 1
-                    st.error(f"❌ {original_filename} failed")
-                    
-            except Exception as e:
-                failed_count += 1
-                st.error(f"❌ {original_filename}: {str(e)}")
-                logger.error(f"Error ingesting {original_filename}: {e}", exc_info=True)
+                    pending.append((original_filename, content_hash, tmp_file_path))
             
-            finally:
+            if pending:
+                # Pass original filename as metadata
+                items = [
+                    {'file_path': str(tmp_file_path), 'metadata': {'original_filename': original_filename}}
+                    for original_filename, _, tmp_file_path in pending
+                ]
+                try:
+                    results = run_pipeline(pipeline, pipeline.ingest_documents(items))
+                except Exception as e:
+                    logger.error(f"Error ingesting batch: {e}", exc_info=True)
+                    results = [None] * len(pending)
+                
+                for (original_filename, content_hash, _), result in zip(pending, results):
+                    if result:
+                        put_cached(content_hash, result)
+                    record(original_filename, result)
+        
+        finally:
+            for _, _, tmp_file_path in pending:
                 Path(tmp_file_path).unlink(missing_ok=True)
-            
-            progress_bar.progress((idx + 1) / len(uploaded_files))
         
-        status_text.text("✨ Ingestion complete!")
+        progress.status_text.text("✨ Ingestion complete!")
         
         if update_stats_callback:
             update_stats_callback(success_count, failed_count)
@@ -74,16 +158,19 @@ def ingest_documents(uploaded_files: List, update_stats_callback=None):
         return 0, len(uploaded_files) if uploaded_files else 0
 
 
+@st.cache_data(ttl=METRICS_TTL_SECONDS, show_spinner=False)
 def get_system_metrics() -> Dict:
     """
     Fetch comprehensive system metrics including DynamoDB and vector store info.
+    Results are cached for METRICS_TTL_SECONDS so dashboard polling does not
+    rescan DynamoDB and ChromaDB on every rerun.
     
     Returns:
         Dictionary with system information
     """
     try:
-        pipeline = create_ingestion_pipeline()
-        metrics = asyncio.run(pipeline.get_system_info())
+        pipeline = get_ingestion_pipeline()
+        metrics = run_pipeline(pipeline, pipeline.get_system_info())
         return metrics
     except Exception as e:
         logger.error(f"Failed to fetch system metrics: {e}", exc_info=True)
@@ -103,9 +190,15 @@ def reset_system(confirm: bool = False) -> Dict:
     Returns:
         Dictionary with reset operation results
     """
+    if not confirm:
+        return {
+            'status': 'cancelled',
+            'message': 'Reset operation requires explicit confirmation (confirm=True)'
+        }
+    
     try:
-        pipeline = create_ingestion_pipeline()
-        result = asyncio.run(pipeline.reset_all_data(confirm=confirm))
+        pipeline = get_ingestion_pipeline()
+        result = run_pipeline(pipeline, pipeline.reset_all_data(confirm=confirm))
         return result
     except Exception as e:
         logger.error(f"Failed to reset system: {e}", exc_info=True)
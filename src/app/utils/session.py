@@ -1,10 +1,51 @@
+import logging
+import os
+import threading
+from collections import deque
 import streamlit as st
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_MAX = int(os.getenv('CHAT_HISTORY_MAX', '200'))
+
+
+def new_chat_history() -> deque:
+    """Bounded chat history; the oldest messages drop off once the cap is reached."""
+    return deque(maxlen=CHAT_HISTORY_MAX)
+
+
+_prewarm_lock = threading.Lock()
+_prewarm_started = False
+
+
+def _prewarm_pipeline():
+    """
+    Build the process-wide pipeline (clients, Chroma connection, collection check)
+    off the critical path. No embedding call: ingestion uses per-run async clients,
+    so a sync Bedrock request would be billed without warming anything it reuses.
+    """
+    try:
+        from utils.ingestion_helper import get_ingestion_pipeline
+        get_ingestion_pipeline()
+        logger.info("Ingestion pipeline prewarmed")
+    except Exception as e:
+        logger.warning(f"Pipeline prewarm failed: {e}")
+
+
+def prewarm_pipeline():
+    """Start the prewarm once per process, not once per browser session"""
+    global _prewarm_started
+    with _prewarm_lock:
+        if _prewarm_started:
+            return
+        _prewarm_started = True
+    threading.Thread(target=_prewarm_pipeline, daemon=True).start()
+
 
 def init_session_state():
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = new_chat_history()
     
     if 'uploaded_files' not in st.session_state:
         st.session_state.uploaded_files = []
@@ -14,6 +55,8 @@ def init_session_state():
     
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = True
+    
+    prewarm_pipeline()
 
 
 def add_message(role: str, content: str, sources=None):
@@ -25,7 +68,7 @@ def add_message(role: str, content: str, sources=None):
 
 
 def clear_chat_history():
-    st.session_state.chat_history = []
+    st.session_state.chat_history.clear()
 
 
 def get_session_value(key: str, default: Any = None) -> Any:
@@ -1 +1 @@
-from ingestion.core import IngestionPipeline, create_ingestion_pipeline
+from .core import IngestionPipeline, create_ingestion_pipeline
@@ -9,16 +9,20 @@ AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', '512'))
 CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', '50'))
+NORMALIZE_EMBEDDINGS = os.getenv('NORMALIZE_EMBEDDINGS', 'true').lower() == 'true'
 VECTOR_DB_TYPE = os.getenv('VECTOR_DB_TYPE', 'chromadb')
 COLLECTION_NAME = os.getenv('COLLECTION_NAME', 'documents')
 CHROMADB_HOST = os.getenv('CHROMADB_HOST', 'localhost')
 CHROMADB_PORT = int(os.getenv('CHROMADB_PORT', '8000'))
+# gzip request bodies at least this large (0 disables; the server or its proxy must accept Content-Encoding: gzip)
+CHROMADB_GZIP_MIN_BYTES = int(os.getenv('CHROMADB_GZIP_MIN_BYTES', '0'))
 
 CLASSIFICATION_TABLE_NAME = os.getenv('CLASSIFICATION_TABLE_NAME',"genai-docqa-poc-dev-data-classification")
 CLASSIFICATION_MODEL_ID = os.getenv('CLASSIFICATION_MODEL_ID',"anthropic.claude-3-sonnet-20240229-v1:0")
 CLASSIFICATION_MAX_TOKENS = int(os.getenv('CLASSIFICATION_MAX_TOKENS', '1000'))
 CLASSIFICATION_TEMPERATURE = float(os.getenv('CLASSIFICATION_TEMPERATURE', '0.1'))
 CONTENT_PREVIEW_MAX_CHARS = int(os.getenv('CONTENT_PREVIEW_MAX_CHARS', '500'))
+INGEST_CONCURRENCY = int(os.getenv('INGEST_CONCURRENCY', '32'))
 
 
 def setup_logging():
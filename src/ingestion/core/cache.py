@@ -0,0 +1,59 @@
+import logging
+import os
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.expanduser(os.getenv('INGESTION_CACHE_DIR', '~/.docqa_cache'))
+CACHE_SIZE_LIMIT = 10 << 30
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        try:
+            import diskcache
+            _cache = diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT)
+            logger.info(f"Ingestion cache opened at {CACHE_DIR}")
+        except ImportError:
+            logger.warning("diskcache not installed, ingestion cache disabled. Install: pip install diskcache")
+            _cache = False
+    # An empty diskcache.Cache is falsy (it defines __len__), so test the sentinel explicitly
+    return None if _cache is False else _cache
+
+
+def get_cached(content_hash: str) -> Optional[Dict]:
+    """Return the ingestion result stored for this content hash, if any"""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(content_hash)
+    except Exception as e:
+        logger.warning(f"Ingestion cache lookup failed: {e}")
+        return None
+
+
+def put_cached(content_hash: str, result: Dict):
+    """Store an ingestion result keyed by the content hash of the upload"""
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(content_hash, result)
+    except Exception as e:
+        logger.warning(f"Ingestion cache write failed: {e}")
+
+
+def clear_cached():
+    """Drop every cached ingestion result, e.g. after the stored data was reset"""
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.clear()
+        logger.info("Ingestion cache cleared")
+    except Exception as e:
+        logger.warning(f"Ingestion cache clear failed: {e}")
@@ -1,36 +1,72 @@
 import logging
-from ingestion import config
-from ingestion.core.pipeline import IngestionPipeline
-from ingestion.services import DocumentProcessor, EmbeddingGenerator, EmbeddingFactory, VectorStoreFactory
-from ingestion.services.classifier import DocumentClassifier
+from .. import config
+from .pipeline import IngestionPipeline
+from ..services import DocumentProcessor, EmbeddingGenerator, EmbeddingFactory, VectorStoreFactory
+from ..services.classifier import DocumentClassifier
+from ..services.cache import ContentCache
+from ..services.aws import AsyncAWSClients
 
 logger = logging.getLogger(__name__)
 
+_EMBEDDER_CLS = EmbeddingFactory.get_class(config.EMBEDDING_PROVIDER)
+_VECTOR_CLS = VectorStoreFactory.get_class(config.VECTOR_DB_TYPE)
+
+BEDROCK_MAX_POOL_CONNECTIONS = 50
+AWS_MAX_RETRY_ATTEMPTS = 5
+
 
 def create_ingestion_pipeline() -> IngestionPipeline:
     logger.info("Initializing ingestion pipeline")
     
+    import boto3
+    from botocore.config import Config
+    
+    # One session (credentials, endpoint resolution) and one bedrock-runtime connection pool
+    # shared by embedder and classifier; adaptive retries back off client-side on throttling
+    session = boto3.Session(region_name=config.AWS_REGION)
+    client_config = Config(
+        max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+        retries={'max_attempts': AWS_MAX_RETRY_ATTEMPTS, 'mode': 'adaptive'}
+    )
+    shared_bedrock_client = session.client('bedrock-runtime', config=client_config)
+    dynamodb_resource = session.resource('dynamodb', config=client_config)
+    
+    # Native async Bedrock/DynamoDB clients (aiobotocore) shared by embedder and classifier
+    async_clients = AsyncAWSClients(config.AWS_REGION, max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS)
+    
+    # Content-addressed cache so re-ingested files skip both the LLM and the embedder
+    content_cache = ContentCache()
+    
     embedding_kwargs = {
         'model_name': config.EMBEDDING_MODEL,
-        'region_name': config.AWS_REGION
+        'region_name': config.AWS_REGION,
+        'bedrock_client': shared_bedrock_client,
+        'content_cache': content_cache,
+        'async_clients': async_clients
     }
     
-    embedding_provider = EmbeddingFactory.create(config.EMBEDDING_PROVIDER, **embedding_kwargs)
+    embedding_provider = _EMBEDDER_CLS(**embedding_kwargs)
     embedder = EmbeddingGenerator(embedding_provider)
     
     vector_store_kwargs = {
         'collection_name': config.COLLECTION_NAME,
         'host': config.CHROMADB_HOST,
         'port': config.CHROMADB_PORT,
+        'gzip_min_bytes': config.CHROMADB_GZIP_MIN_BYTES,
         'embedding_dimension': embedder.get_dimension()
     }
     
     processor = DocumentProcessor(config.CHUNK_SIZE, config.CHUNK_OVERLAP)
-    classifier = DocumentClassifier()
+    classifier = DocumentClassifier(
+        bedrock_client=shared_bedrock_client,
+        dynamodb_resource=dynamodb_resource,
+        content_cache=content_cache,
+        async_clients=async_clients
+    )
     
     return IngestionPipeline(
         processor=processor,
         embedder=embedder,
-        vector_store=VectorStoreFactory.create(config.VECTOR_DB_TYPE, **vector_store_kwargs),
+        vector_store=_VECTOR_CLS(**vector_store_kwargs),
         classifier=classifier
     )
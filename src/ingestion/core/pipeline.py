@@ -1,12 +1,116 @@
 import asyncio
 import logging
-from pathlib import Path
-from typing import Dict, Optional, List
-from ingestion.services import DocumentProcessor, EmbeddingGenerator, VectorStore
-from ingestion.services.classifier import DocumentClassifier
+import os
+import threading
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Optional, List, Tuple
+from ..services import DocumentProcessor, EmbeddingGenerator, VectorStore, new_vector_ids
+from ..services.classifier import DocumentClassifier
+from ..config.settings import NORMALIZE_EMBEDDINGS
+from .cache import clear_cached
+from .vectors import l2_normalize
 
 logger = logging.getLogger(__name__)
 
+PREPARE_CONCURRENCY = 8
+EMBED_BATCH_MAX_ITEMS = 4000
+EMBED_BATCH_MAX_CHARS = 150_000
+COUNT_CONCURRENCY = 16
+RESET_CONCURRENCY = 16
+METRICS_CACHE_TTL = 5.0
+DYNAMODB_BATCH_WRITE_MAX = 25
+BATCH_WRITE_MAX_RETRIES = 5
+CHUNK_BATCH = 256
+STREAM_QUEUE_SIZE = 32
+STREAM_PREVIEW_WORKERS = 8
+STREAM_CLASSIFY_WORKERS = 4
+STREAM_CHUNK_WORKERS = os.cpu_count() or 4
+STREAM_EMBED_WORKERS = 2
+STREAM_INSERT_WORKERS = 4
+STREAM_PROGRESS_INTERVAL = 10.0
+
+VECTOR_STORE_CAPABILITIES = (
+    'set_collection', 'add_embeddings_bulk', 'add_embeddings_bulk_to', 'aadd_embeddings_bulk',
+    'aadd_embeddings_bulk_to',
+    'add_embedding', 'aadd_embedding', 'reset_all_collections', 'delete_all', 'list_collections',
+    'get_collections_info', 'get_collection', 'delete_collection', 'get_category_distribution',
+    'total_document_count', 'clear_collection_cache'
+)
+
+_RESET_STATUS_SCORES = {'success': 2, 'skipped': 2, 'partial_success': 1}
+
+def _pdf_preview(file_path: str, max_lines: int) -> str:
+    from pypdf import PdfReader
+    lines = []
+    with open(file_path, 'rb') as f:
+        reader = PdfReader(f, strict=False)
+        if len(reader.pages) > 0:
+            for line in (reader.pages[0].extract_text() or "").splitlines():
+                line = line.strip()
+                if line:
+                    lines.append(line)
+                    if len(lines) == max_lines:
+                        break
+    return '\n'.join(lines)
+
+
+def _text_preview(file_path: str, max_lines: int) -> str:
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = [line.strip() for line in islice(f, max_lines)]
+    return '\n'.join([line for line in lines if line])
+
+
+async def _aio_text_preview(file_path: str, max_lines: int) -> str:
+    try:
+        import aiofiles
+    except ImportError:
+        return await asyncio.to_thread(_text_preview, file_path, max_lines)
+    
+    lines = []
+    async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for _ in range(max_lines):
+            line = await f.readline()
+            if not line:
+                break
+            lines.append(line.strip())
+    return '\n'.join([line for line in lines if line])
+
+
+def _summarize_collections(collections: List[Dict]):
+    """Return (total document count, collection names) in a single pass"""
+    total = 0
+    names = []
+    for c in collections:
+        total += c.get('document_count', 0)
+        names.append(c.get('collection_name', 'unknown'))
+    return total, names
+
+
+def _category_ids(categories: List[Dict]) -> List[str]:
+    return [cat.get('category_id', 'unknown') for cat in categories]
+
+
+def _default_classification() -> Dict:
+    return {
+        'category_id': 'general_documents',
+        'description': 'Automatically classified document',
+        'vector_collection_name': 'general_documents',
+        'is_new': False
+    }
+
+
+def _document_metadata(filename: str, metadata: Optional[Dict], classification: Dict) -> Dict:
+    doc_metadata = metadata or {}
+    doc_metadata.update({
+        'source_file': filename,
+        'filename': filename,
+        'description': classification['description'],
+        'category_id': classification['category_id'],
+        'vector_collection_name': classification['vector_collection_name']
+    })
+    return doc_metadata
+
 
 class IngestionPipeline:
     
@@ -15,125 +119,548 @@ class IngestionPipeline:
         self.embedder = embedder
         self.vector_store = vector_store
         self.classifier = classifier
+        # Probe the store's optional methods once instead of calling hasattr on every use
+        self._vs_caps = {name: hasattr(vector_store, name) for name in VECTOR_STORE_CAPABILITIES}
+        self._vs_caps['client.list_collections'] = hasattr(getattr(vector_store, 'client', None), 'list_collections')
         self._stats = {'documents': 0, 'chunks': 0, 'failed': 0}
-        self._lock = asyncio.Lock()
+        # Stats updates never await, so a plain thread lock is enough (and safe across event loops)
+        self._lock = threading.Lock()
+        self._static_info: Optional[Dict] = None
+        self._metrics_cache: Dict[str, tuple] = {}
     
     async def ingest_document(self, file_path: str, metadata: Optional[Dict] = None, content_preview: Optional[str] = None) -> Optional[Dict]:
         try:
             logger.info(f"Ingesting: {file_path}")
             
-            file_path_obj = Path(file_path)
+            prepared = await self._prepare_document(file_path, metadata, content_preview)
+            if prepared is None:
+                return None
+            classification, chunks, doc_metadata = prepared
             
-            filename = metadata.get('original_filename') if metadata else file_path_obj.name
-            if not filename:
-                filename = file_path_obj.name
+            vector_collection_name = classification.get('vector_collection_name', 'general_documents')
             
-            if not content_preview:
-                content_preview = await self._extract_preview(file_path)
+            embeddings = await self._embed_chunks(chunks)
+            embeddings = self._finalize_embeddings(embeddings)
             
-            try:
-                classification = await self.classifier.classify_document(filename, content_preview or "")
-                logger.info(f"Classification: {classification['category_id']} "
-                           f"({'NEW' if classification.get('is_new') else 'EXISTING'})")
-            except Exception as e:
-                logger.warning(f"Classification failed, using default: {e}")
-                classification = {
-                    'category_id': 'general_documents',
-                    'description': 'Automatically classified document',
-                    'vector_collection_name': 'general_documents',
-                    'is_new': False
-                }
+            vectors_data = self._build_vectors(chunks, embeddings, doc_metadata)
+            await self._store_vectors(vectors_data, vector_collection_name)
             
-            vector_collection_name = classification.get('vector_collection_name', 'general_documents')
+            with self._lock:
+                self._stats['documents'] += 1
+                self._stats['chunks'] += len(chunks)
+            self._invalidate_metrics_cache()
             
-            chunks = await asyncio.to_thread(self.processor.process_document, file_path)
-            if not chunks:
-                logger.warning(f"No chunks from {file_path}")
-                return None
+            logger.info(f"Ingested: {file_path} ({len(chunks)} chunks) to collection: {vector_collection_name}")
+            return classification
             
-            chunk_contents = [c.content for c in chunks]
-            embeddings = await self.embedder.generate_embeddings_async(chunk_contents)
+        except Exception as e:
+            logger.error(f"Failed: {file_path} - {e}", exc_info=True)
+            with self._lock:
+                self._stats['failed'] += 1
+            return None
+    
+    async def ingest_documents(self, items: List) -> List[Optional[Dict]]:
+        """
+        Ingest several documents with batched embedding calls across files and
+        one bulk insert per target collection.
+        
+        Args:
+            items: File paths, or dicts with 'file_path' and optional 'metadata' / 'content_preview'
             
-            doc_metadata = metadata or {}
-            doc_metadata.update({
-                'source_file': filename,
-                'filename': filename,
-                'description': classification['description'],
-                'category_id': classification['category_id'],
-                'vector_collection_name': classification['vector_collection_name']
-            })
+        Returns:
+            Classification per item (same order), or None where ingestion failed
+        """
+        items = [item if isinstance(item, dict) else {'file_path': item} for item in items]
+        logger.info(f"Bulk ingesting {len(items)} documents")
+        
+        classifications = await self._classify_many(items)
+        
+        semaphore = asyncio.Semaphore(PREPARE_CONCURRENCY)
+        
+        async def prepare(item, classification):
+            async with semaphore:
+                return await self._prepare_document(
+                    item['file_path'], item.get('metadata'), item.get('content_preview'), classification
+                )
+        
+        prepared = await asyncio.gather(
+            *[prepare(item, classification) for item, classification in zip(items, classifications)],
+            return_exceptions=True
+        )
+        
+        results: List[Optional[Dict]] = [None] * len(items)
+        ready = []
+        failed = 0
+        
+        for idx, (item, outcome) in enumerate(zip(items, prepared)):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed: {item['file_path']} - {outcome}")
+                failed += 1
+            elif outcome is None:
+                continue
+            else:
+                ready.append((idx, *outcome))
+        
+        async def embed_docs(docs) -> List[List]:
+            contents = [chunk.content for _, _, chunks, _ in docs for chunk in chunks]
+            embeddings = self._finalize_embeddings(await self._embed_in_batches(contents))
+            per_doc = []
+            offset = 0
+            for _, _, chunks, _ in docs:
+                per_doc.append(embeddings[offset:offset + len(chunks)])
+                offset += len(chunks)
+            return per_doc
+        
+        embedded = []
+        try:
+            embedded = list(zip(ready, await embed_docs(ready)))
+        except Exception as e:
+            # Retry per document so one failing text only fails its own document
+            logger.warning(f"Bulk embedding failed for {len(ready)} documents, retrying one by one: {e}")
+            for doc in ready:
+                try:
+                    embedded.append((doc, (await embed_docs([doc]))[0]))
+                except Exception as doc_error:
+                    logger.error(f"Embedding failed: {items[doc[0]]['file_path']} - {doc_error}")
+                    failed += 1
+        
+        buckets: Dict[str, List] = {}
+        for (idx, classification, chunks, doc_metadata), doc_embeddings in embedded:
+            collection_name = classification.get('vector_collection_name', 'general_documents')
+            buckets.setdefault(collection_name, []).append(
+                (idx, classification, len(chunks), self._build_vectors(chunks, doc_embeddings, doc_metadata))
+            )
+        
+        async def store_bucket(collection_name, docs) -> bool:
+            vectors_data = [vector for _, _, _, vectors in docs for vector in vectors]
+            try:
+                await self._store_vectors(vectors_data, collection_name)
+                return True
+            except Exception as e:
+                logger.error(f"Bulk insert into {collection_name} failed: {e}", exc_info=True)
+                return False
+        
+        if self._vs_caps['add_embeddings_bulk_to']:
+            # One insert per collection, all collections in parallel
+            stored = await asyncio.gather(*[store_bucket(name, docs) for name, docs in buckets.items()])
+        else:
+            # Stores bound to a "current collection" must be switched serially
+            stored = [await store_bucket(name, docs) for name, docs in buckets.items()]
+        
+        documents = 0
+        chunk_count = 0
+        for docs, ok in zip(buckets.values(), stored):
+            if not ok:
+                failed += len(docs)
+                continue
             
-            vectors_data = [
-                {
-                    'embedding': embedding,
-                    'content': chunk.content,
-                    'metadata': {**doc_metadata, **chunk.metadata}
-                }
-                for chunk, embedding in zip(chunks, embeddings)
-            ]
+            for idx, classification, n_chunks, _ in docs:
+                results[idx] = classification
+                documents += 1
+                chunk_count += n_chunks
+        
+        with self._lock:
+            self._stats['documents'] += documents
+            self._stats['chunks'] += chunk_count
+            self._stats['failed'] += failed
+        self._invalidate_metrics_cache()
+        
+        logger.info(f"Bulk ingested {documents}/{len(items)} documents ({chunk_count} chunks) "
+                    f"into {len(buckets)} collections")
+        return results
+    
+    async def ingest_stream(
+        self,
+        items: Iterable,
+        preview_fn: Optional[Callable[[str], str]] = None,
+        max_in_flight: Optional[int] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Ingest a large set of documents as a staged pipeline:
+        preview -> classify -> chunk -> embed -> insert.
+        
+        Each stage has its own worker pool and a bounded queue to the next, so
+        slow embedding never stalls previews/classification of later files.
+        Embed workers coalesce chunks from whichever documents are queued into
+        one embedding call of up to CHUNK_BATCH chunks.
+        
+        Args:
+            items: File paths, or dicts with 'file_path' and optional 'metadata' / 'content_preview'
+            preview_fn: Optional sync preview extractor, run in a worker thread instead of the default
+            max_in_flight: Optional cap on documents between admission and insert/failure;
+                items are read from `items` only as earlier documents finish
             
+        Returns:
+            Classification per item (same order), or None where ingestion failed
+        """
+        preview_q = asyncio.Queue(STREAM_QUEUE_SIZE)
+        classify_q = asyncio.Queue(STREAM_QUEUE_SIZE)
+        chunk_q = asyncio.Queue(STREAM_QUEUE_SIZE)
+        embed_q = asyncio.Queue(STREAM_QUEUE_SIZE)
+        insert_q = asyncio.Queue(STREAM_QUEUE_SIZE)
+        results: Dict[int, Optional[Dict]] = {}
+        admission = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        progress = {'admitted': 0, 'finished': 0}
+        
+        def finish():
+            progress['finished'] += 1
+            if admission is not None:
+                admission.release()
+        
+        async def report_progress():
+            while True:
+                await asyncio.sleep(STREAM_PROGRESS_INTERVAL)
+                running = progress['admitted'] - progress['finished']
+                logger.info(f"Stream progress: {progress['finished']} done, {running} running, "
+                            f"{preview_q.qsize()} waiting for preview")
+        
+        async def preview(job):
+            job['filename'] = self._resolve_filename(job['file_path'], job.get('metadata'))
+            if not job.get('content_preview'):
+                if preview_fn is not None:
+                    job['content_preview'] = await asyncio.to_thread(preview_fn, job['file_path'])
+                else:
+                    job['content_preview'] = await self._extract_preview(job['file_path'])
+            return job
+        
+        async def classify(job):
             try:
-                await asyncio.to_thread(self.vector_store.add_embeddings_bulk, vectors_data)
-                logger.info(f"Successfully added {len(vectors_data)} vectors to collection: {vector_collection_name}")
+                job['classification'] = await self.classifier.classify_document(
+                    job['filename'], job['content_preview'] or ""
+                )
             except Exception as e:
-                logger.error(f"Vector store bulk insert failed: {e}")
-                success_count = 0
-                for i, vector_data in enumerate(vectors_data):
-                    try:
-                        if hasattr(self.vector_store, 'set_collection'):
-                            await asyncio.to_thread(self.vector_store.set_collection, vector_collection_name)
-                        
-                        if hasattr(self.vector_store, 'add_embedding'):
-                            await asyncio.to_thread(
-                                self.vector_store.add_embedding,
-                                vector_data['embedding'],
-                                vector_data['content'],
-                                vector_data['metadata']
-                            )
-                            success_count += 1
-                        else:
-                            logger.error(f"No suitable method found for adding embeddings to vector store")
-                            break
-                    except Exception as individual_error:
-                        logger.error(f"Failed to add vector {i}: {individual_error}")
-                        continue
-                
-                if success_count > 0:
-                    logger.info(f"Successfully added {success_count}/{len(vectors_data)} vectors using fallback method")
-                else:
-                    raise Exception(f"All vector insertion attempts failed for collection: {vector_collection_name}")
+                logger.warning(f"Classification failed, using default: {e}")
+                job['classification'] = _default_classification()
+            return job
+        
+        async def chunk(job):
+            job['chunks'] = await asyncio.to_thread(self.processor.process_document, job['file_path'])
+            if not job['chunks']:
+                logger.warning(f"No chunks from {job['file_path']}")
+                return None
+            return job
+        
+        async def embed_jobs(jobs):
+            contents = [chunk.content for job in jobs for chunk in job['chunks']]
+            embeddings = self._finalize_embeddings(await self._embed_in_batches(contents))
             
-            async with self._lock:
+            offset = 0
+            for job in jobs:
+                doc_embeddings = embeddings[offset:offset + len(job['chunks'])]
+                offset += len(job['chunks'])
+                doc_metadata = _document_metadata(job['filename'], job.get('metadata'), job['classification'])
+                job['vectors'] = self._build_vectors(job['chunks'], doc_embeddings, doc_metadata)
+        
+        async def embed_worker():
+            while True:
+                jobs = [await embed_q.get()]
+                try:
+                    # Top up the batch with documents already waiting, without blocking for more
+                    n_chunks = len(jobs[0]['chunks'])
+                    while n_chunks < CHUNK_BATCH and not embed_q.empty():
+                        jobs.append(embed_q.get_nowait())
+                        n_chunks += len(jobs[-1]['chunks'])
+                    
+                    try:
+                        await embed_jobs(jobs)
+                        embedded = jobs
+                    except Exception as e:
+                        if len(jobs) == 1:
+                            raise
+                        # Retry per document so one failing text does not fail the whole coalesced batch
+                        logger.warning(f"Embedding failed for {len(jobs)} coalesced documents, retrying one by one: {e}")
+                        embedded = []
+                        for job in jobs:
+                            try:
+                                await embed_jobs([job])
+                                embedded.append(job)
+                            except Exception as job_error:
+                                logger.error(f"Embedding failed: {job['file_path']} - {job_error}")
+                                with self._lock:
+                                    self._stats['failed'] += 1
+                                finish()
+                    
+                    for job in embedded:
+                        await insert_q.put(job)
+                except Exception as e:
+                    logger.error(f"Embedding failed for {len(jobs)} documents: {e}", exc_info=True)
+                    with self._lock:
+                        self._stats['failed'] += len(jobs)
+                    for job in jobs:
+                        finish()
+                finally:
+                    for _ in jobs:
+                        embed_q.task_done()
+        
+        async def insert(job):
+            classification = job['classification']
+            await self._store_vectors(job['vectors'], classification.get('vector_collection_name', 'general_documents'))
+            with self._lock:
                 self._stats['documents'] += 1
-                self._stats['chunks'] += len(chunks)
+                self._stats['chunks'] += len(job['chunks'])
+            results[job['idx']] = classification
+            logger.info(f"Ingested: {job['file_path']} ({len(job['chunks'])} chunks)")
+        
+        async def worker(stage, in_q, out_q):
+            while True:
+                job = await in_q.get()
+                try:
+                    if await stage(job) is None or out_q is None:
+                        finish()
+                    else:
+                        await out_q.put(job)
+                except Exception as e:
+                    logger.error(f"Failed: {job['file_path']} - {e}", exc_info=True)
+                    with self._lock:
+                        self._stats['failed'] += 1
+                    finish()
+                finally:
+                    in_q.task_done()
+        
+        # Stores bound to a "current collection" must not switch collections concurrently
+        insert_workers = STREAM_INSERT_WORKERS if self._vs_caps['add_embeddings_bulk_to'] else 1
+        stages = [
+            (preview, preview_q, classify_q, STREAM_PREVIEW_WORKERS),
+            (classify, classify_q, chunk_q, STREAM_CLASSIFY_WORKERS),
+            (chunk, chunk_q, embed_q, STREAM_CHUNK_WORKERS),
+            (insert, insert_q, None, insert_workers),
+        ]
+        workers = [
+            asyncio.create_task(worker(stage, in_q, out_q))
+            for stage, in_q, out_q, count in stages
+            for _ in range(count)
+        ]
+        workers += [asyncio.create_task(embed_worker()) for _ in range(STREAM_EMBED_WORKERS)]
+        workers.append(asyncio.create_task(report_progress()))
+        
+        total = 0
+        try:
+            for idx, item in enumerate(items):
+                if admission is not None:
+                    await admission.acquire()
+                job = dict(item) if isinstance(item, dict) else {'file_path': item}
+                job['idx'] = idx
+                progress['admitted'] += 1
+                await preview_q.put(job)
+                total += 1
             
-            logger.info(f"Ingested: {file_path} ({len(chunks)} chunks) to collection: {vector_collection_name}")
-            return classification
+            # Each queue is drained only after everything upstream has been handed on
+            for queue in (preview_q, classify_q, chunk_q, embed_q, insert_q):
+                await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._invalidate_metrics_cache()
+        
+        logger.info(f"Stream ingested {len(results)}/{total} documents")
+        return [results.get(idx) for idx in range(total)]
+    
+    async def _embed_chunks(self, chunks: List) -> List:
+        """Embed chunk contents in CHUNK_BATCH slices into a pre-allocated result list"""
+        embeddings: List = [None] * len(chunks)
+        for start in range(0, len(chunks), CHUNK_BATCH):
+            batch = [c.content for c in chunks[start:start + CHUNK_BATCH]]
+            embeddings[start:start + len(batch)] = await self._embed_unique(batch)
+        return embeddings
+    
+    async def _embed_unique(self, texts: List[str]) -> List:
+        """
+        Embed a batch, sending repeated texts (boilerplate headers/footers) once.
+        Cross-batch reuse is the embedder's content cache.
+        """
+        unique_slots: Dict[str, int] = {}
+        index_map = [unique_slots.setdefault(text, len(unique_slots)) for text in texts]
+        
+        if len(unique_slots) == len(texts):
+            return list(await self.embedder.generate_embeddings_async(texts))
+        
+        fresh = await self.embedder.generate_embeddings_async(list(unique_slots))
+        logger.info(f"Embedding: {len(texts) - len(unique_slots)}/{len(texts)} chunks were in-batch duplicates")
+        return [fresh[slot] for slot in index_map]
+    
+    async def _embed_in_batches(self, texts: List[str]) -> List:
+        """
+        Embed texts from many documents in batches capped by item count and
+        total characters; a failing batch is retried one text at a time.
+        """
+        embeddings: List = [None] * len(texts)
+        
+        start = 0
+        while start < len(texts):
+            end = start
+            chars = 0
+            while end < len(texts) and end - start < EMBED_BATCH_MAX_ITEMS:
+                if end > start and chars + len(texts[end]) > EMBED_BATCH_MAX_CHARS:
+                    break
+                chars += len(texts[end])
+                end += 1
             
+            batch = texts[start:end]
+            try:
+                embeddings[start:end] = await self._embed_unique(batch)
+            except Exception as e:
+                logger.warning(f"Embedding batch of {len(batch)} failed, retrying one by one: {e}")
+                for i, text in enumerate(batch):
+                    embeddings[start + i] = (await self._embed_unique([text]))[0]
+            
+            logger.debug("Embedded batch %d-%d (%d chars)", start, end, chars)
+            start = end
+        
+        return embeddings
+    
+    async def _classify_many(self, items: List[Dict]) -> List[Optional[Dict]]:
+        """Classify a batch up front with one LLM call per preview bucket; None means classify per document"""
+        if not hasattr(self.classifier, 'classify_many'):
+            return [None] * len(items)
+        
+        try:
+            filenames = [self._resolve_filename(item['file_path'], item.get('metadata')) for item in items]
+            previews = await asyncio.gather(*[self._preview_for(item) for item in items])
+            classifications = await self.classifier.classify_many(
+                [(filename, preview or "") for filename, preview in zip(filenames, previews)]
+            )
+            for classification in classifications:
+                logger.info(f"Classification: {classification['category_id']} "
+                           f"({'NEW' if classification.get('is_new') else 'EXISTING'})")
+            return classifications
         except Exception as e:
-            logger.error(f"Failed: {file_path} - {e}", exc_info=True)
-            async with self._lock:
-                self._stats['failed'] += 1
+            logger.warning(f"Batch classification failed, classifying per document: {e}")
+            return [None] * len(items)
+    
+    async def _preview_for(self, item: Dict) -> str:
+        return item.get('content_preview') or await self._extract_preview(item['file_path'])
+    
+    def _resolve_filename(self, file_path: str, metadata: Optional[Dict]) -> str:
+        return (metadata or {}).get('original_filename') or os.path.basename(file_path)
+    
+    async def _prepare_document(
+        self,
+        file_path: str,
+        metadata: Optional[Dict],
+        content_preview: Optional[str],
+        classification: Optional[Dict] = None
+    ):
+        """Classify and chunk a document; returns (classification, chunks, doc_metadata) or None"""
+        filename = self._resolve_filename(file_path, metadata)
+        
+        # Chunking is independent of classification, so run it alongside the LLM call
+        chunks_task = asyncio.create_task(asyncio.to_thread(self.processor.process_document, file_path))
+        
+        if classification is None:
+            if not content_preview:
+                content_preview = await self._extract_preview(file_path)
+            
+            cls_task = asyncio.create_task(self.classifier.classify_document(filename, content_preview or ""))
+            classification, chunks = await asyncio.gather(cls_task, chunks_task, return_exceptions=True)
+            
+            if isinstance(classification, Exception):
+                logger.warning(f"Classification failed, using default: {classification}")
+                classification = _default_classification()
+            else:
+                logger.info(f"Classification: {classification['category_id']} "
+                           f"({'NEW' if classification.get('is_new') else 'EXISTING'})")
+            
+            if isinstance(chunks, Exception):
+                raise chunks
+        else:
+            chunks = await chunks_task
+        
+        if not chunks:
+            logger.warning(f"No chunks from {file_path}")
             return None
+        
+        return classification, chunks, _document_metadata(filename, metadata, classification)
+    
+    def _finalize_embeddings(self, embeddings: List) -> List:
+        if NORMALIZE_EMBEDDINGS:
+            embeddings = l2_normalize(embeddings)
+        return embeddings
+    
+    def _build_vectors(self, chunks: List, embeddings: List, doc_metadata: Dict) -> List[Dict]:
+        vectors_data = []
+        # Ids are fixed here so every retry of these vectors writes the same rows
+        for chunk, embedding, vector_id in zip(chunks, embeddings, new_vector_ids(len(chunks))):
+            # dict.copy() clones the shared document metadata without re-hashing its keys
+            metadata = doc_metadata.copy()
+            metadata.update(chunk.metadata)
+            vectors_data.append({
+                'id': vector_id,
+                'embedding': embedding,
+                'content': chunk.content,
+                'metadata': metadata
+            })
+        return vectors_data
+    
+    async def _add_bulk(self, vectors_data: List[Dict], vector_collection_name: str):
+        # Native async stores skip the thread-pool hop
+        if self._vs_caps['aadd_embeddings_bulk_to']:
+            await self.vector_store.aadd_embeddings_bulk_to(vector_collection_name, vectors_data)
+        elif self._vs_caps['aadd_embeddings_bulk']:
+            await self.vector_store.aadd_embeddings_bulk(vectors_data)
+        elif self._vs_caps['add_embeddings_bulk_to']:
+            await asyncio.to_thread(self.vector_store.add_embeddings_bulk_to, vector_collection_name, vectors_data)
+        else:
+            await asyncio.to_thread(self.vector_store.add_embeddings_bulk, vectors_data)
+    
+    async def _add_one(self, vector_data: Dict):
+        args = (vector_data['embedding'], vector_data['content'], vector_data['metadata'])
+        if self._vs_caps['aadd_embedding']:
+            await self.vector_store.aadd_embedding(*args)
+        else:
+            await asyncio.to_thread(self.vector_store.add_embedding, *args)
+    
+    async def _store_vectors(self, vectors_data: List[Dict], vector_collection_name: str):
+        try:
+            await self._add_bulk(vectors_data, vector_collection_name)
+            logger.info(f"Successfully added {len(vectors_data)} vectors to collection: {vector_collection_name}")
+        except Exception as e:
+            logger.error(f"Vector store bulk insert failed: {e}")
+            
+            # The target collection is the same for every fallback insert, so select it once
+            if self._vs_caps['set_collection']:
+                await asyncio.to_thread(self.vector_store.set_collection, vector_collection_name)
+            
+            success_count = await self._bulk_with_bisect(vectors_data, vector_collection_name)
+            
+            if success_count > 0:
+                logger.info(f"Successfully added {success_count}/{len(vectors_data)} vectors using fallback method")
+            else:
+                raise Exception(f"All vector insertion attempts failed for collection: {vector_collection_name}")
+    
+    async def _bulk_with_bisect(self, vectors_data: List[Dict], vector_collection_name: str) -> int:
+        """Retry a failed bulk insert by halving it until the halves succeed; returns vectors stored"""
+        if len(vectors_data) == 1:
+            try:
+                if self._vs_caps['add_embedding'] or self._vs_caps['aadd_embedding']:
+                    await self._add_one(vectors_data[0])
+                    return 1
+                logger.error(f"No suitable method found for adding embeddings to vector store")
+            except Exception as individual_error:
+                logger.error(f"Failed to add vector: {individual_error}")
+            return 0
+        
+        mid = len(vectors_data) // 2
+        success_count = 0
+        for half in (vectors_data[:mid], vectors_data[mid:]):
+            try:
+                await self._add_bulk(half, vector_collection_name)
+                success_count += len(half)
+            except Exception as e:
+                logger.warning(f"Bulk insert of {len(half)} vectors failed, splitting further: {e}")
+                success_count += await self._bulk_with_bisect(half, vector_collection_name)
+        return success_count
     
     async def _extract_preview(self, file_path: str, max_lines: int = 5) -> str:
         try:
-            file_ext = Path(file_path).suffix.lower()
+            file_ext = os.path.splitext(file_path)[1].lower()
             
             if file_ext in ['.txt', '.md', '.csv']:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = [f.readline().strip() for _ in range(max_lines)]
-                    return '\n'.join([line for line in lines if line])
+                return await _aio_text_preview(file_path, max_lines)
             
             elif file_ext == '.pdf':
                 try:
-                    import PyPDF2
-                    with open(file_path, 'rb') as f:
-                        reader = PyPDF2.PdfReader(f)
-                        if len(reader.pages) > 0:
-                            text = reader.pages[0].extract_text()
-                            lines = [line.strip() for line in text.split('\n') if line.strip()]
-                            return '\n'.join(lines[:max_lines])
+                    return await asyncio.to_thread(_pdf_preview, file_path, max_lines)
                 except Exception as e:
                     logger.warning(f"PDF preview extraction failed: {e}")
             
@@ -142,13 +669,55 @@ class IngestionPipeline:
             logger.warning(f"Preview extraction failed for {file_path}: {e}")
             return ""
     
+    async def aclose(self):
+        """Flush pending category counts and close async AWS and vector store clients bound to the running event loop"""
+        if hasattr(self.classifier, 'flush_counts'):
+            try:
+                await self.classifier.flush_counts()
+            except Exception as e:
+                logger.error(f"Failed to flush category counts: {e}")
+        
+        seen = set()
+        for component in (getattr(self.embedder, 'provider', self.embedder), self.classifier):
+            clients = getattr(component, 'async_clients', None)
+            if clients is not None and id(clients) not in seen:
+                seen.add(id(clients))
+                await clients.close()
+        
+        if hasattr(self.vector_store, 'aclose'):
+            await self.vector_store.aclose()
+    
     def get_stats(self) -> Dict[str, int]:
-        return self._stats.copy()
+        return dict(self._stats)
+    
+    def _stats_snapshot(self) -> Tuple[int, int, int]:
+        """(documents, chunks, failed) read together, so metrics never mix two updates"""
+        with self._lock:
+            return self._stats['documents'], self._stats['chunks'], self._stats['failed']
+    
+    async def _cached(self, key: str, ttl: float, fetch):
+        """Return the cached value for key if younger than ttl seconds, else fetch and store it"""
+        entry = self._metrics_cache.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        value = await fetch()
+        self._metrics_cache[key] = (now, value)
+        return value
+    
+    def _invalidate_metrics_cache(self):
+        self._metrics_cache.clear()
     
     async def get_existing_categories(self) -> List[Dict]:
+        return await self._cached('categories', METRICS_CACHE_TTL, self._fetch_existing_categories)
+    
+    async def _fetch_existing_categories(self) -> List[Dict]:
         try:
             logger.info("Fetching existing categories from DynamoDB")
-            categories = await self.classifier._get_all_categories()
+            # Metrics need live document counts, not the classifier's category snapshot
+            if hasattr(self.classifier, 'flush_counts'):
+                await self.classifier.flush_counts()
+            categories = await self.classifier._get_all_categories(refresh=True)
             logger.info(f"Found {len(categories)} categories in DynamoDB")
             return categories
         except Exception as e:
@@ -156,84 +725,25 @@ class IngestionPipeline:
             return []
     
     async def get_vector_collections_info(self) -> List[Dict]:
+        return await self._cached('collections', METRICS_CACHE_TTL, self._fetch_vector_collections_info)
+    
+    async def _fetch_vector_collections_info(self) -> List[Dict]:
         try:
             logger.info("Fetching vector database collections info")
             
-            if hasattr(self.vector_store, 'get_collections_info'):
+            if self._vs_caps['get_collections_info']:
                 collections_info = await asyncio.to_thread(self.vector_store.get_collections_info)
                 logger.info(f"Found {len(collections_info)} collections in vector database")
                 return collections_info
-            elif hasattr(self.vector_store, 'list_collections'):
+            elif self._vs_caps['list_collections']:
                 collections = await asyncio.to_thread(self.vector_store.list_collections)
-                collections_info = []
-                
-                for collection in collections:
-                    try:
-                        if hasattr(collection, 'name') and hasattr(collection, 'count'):
-                            count = await asyncio.to_thread(collection.count)
-                            collections_info.append({
-                                'collection_name': collection.name,
-                                'document_count': count,
-                                'status': 'active'
-                            })
-                        elif isinstance(collection, str):
-                            if hasattr(self.vector_store, 'get_collection'):
-                                try:
-                                    col_obj = await asyncio.to_thread(self.vector_store.get_collection, collection)
-                                    count = await asyncio.to_thread(col_obj.count) if hasattr(col_obj, 'count') else 0
-                                    collections_info.append({
-                                        'collection_name': collection,
-                                        'document_count': count,
-                                        'status': 'active'
-                                    })
-                                except Exception as e:
-                                    logger.warning(f"Could not get count for collection {collection}: {e}")
-                                    collections_info.append({
-                                        'collection_name': collection,
-                                        'document_count': 0,
-                                        'status': 'unknown'
-                                    })
-                            else:
-                                collections_info.append({
-                                    'collection_name': collection,
-                                    'document_count': 0,
-                                    'status': 'unknown'
-                                })
-                        else:
-                            collections_info.append({
-                                'collection_name': str(collection),
-                                'document_count': 0,
-                                'status': 'unknown'
-                            })
-                    except Exception as e:
-                        logger.warning(f"Error processing collection {collection}: {e}")
-                        collections_info.append({
-                            'collection_name': str(collection),
-                            'document_count': 0,
-                            'status': 'error'
-                        })
+                collections_info = await self._gather_bounded(self._collection_info, collections)
                 
                 logger.info(f"Found {len(collections_info)} collections (using list_collections method)")
                 return collections_info
-            elif hasattr(self.vector_store, 'client') and hasattr(self.vector_store.client, 'list_collections'):
+            elif self._vs_caps['client.list_collections']:
                 collections = await asyncio.to_thread(self.vector_store.client.list_collections)
-                collections_info = []
-                
-                for collection in collections:
-                    try:
-                        count = await asyncio.to_thread(collection.count) if hasattr(collection, 'count') else 0
-                        collections_info.append({
-                            'collection_name': collection.name if hasattr(collection, 'name') else str(collection),
-                            'document_count': count,
-                            'status': 'active'
-                        })
-                    except Exception as e:
-                        logger.warning(f"Error getting count for collection: {e}")
-                        collections_info.append({
-                            'collection_name': collection.name if hasattr(collection, 'name') else str(collection),
-                            'document_count': 0,
-                            'status': 'error'
-                        })
+                collections_info = await self._gather_bounded(self._client_collection_info, collections)
                 
                 logger.info(f"Found {len(collections_info)} collections (using client.list_collections)")
                 return collections_info
@@ -245,6 +755,73 @@ class IngestionPipeline:
             logger.error(f"Failed to fetch vector collections info: {e}", exc_info=True)
             return []
     
+    async def _gather_bounded(self, fn, items, limit: int = COUNT_CONCURRENCY) -> List:
+        """Run fn over items concurrently, at most `limit` at a time, preserving order"""
+        semaphore = asyncio.Semaphore(limit)
+        
+        async def run(item):
+            async with semaphore:
+                return await fn(item)
+        
+        return list(await asyncio.gather(*[run(item) for item in items]))
+    
+    async def _collection_info(self, collection) -> Dict:
+        try:
+            if hasattr(collection, 'name') and hasattr(collection, 'count'):
+                count = await asyncio.to_thread(collection.count)
+                return {
+                    'collection_name': collection.name,
+                    'document_count': count,
+                    'status': 'active'
+                }
+            elif isinstance(collection, str):
+                if self._vs_caps['get_collection']:
+                    try:
+                        col_obj = await asyncio.to_thread(self.vector_store.get_collection, collection)
+                        count = await asyncio.to_thread(col_obj.count) if hasattr(col_obj, 'count') else 0
+                        return {
+                            'collection_name': collection,
+                            'document_count': count,
+                            'status': 'active'
+                        }
+                    except Exception as e:
+                        logger.warning(f"Could not get count for collection {collection}: {e}")
+                return {
+                    'collection_name': collection,
+                    'document_count': 0,
+                    'status': 'unknown'
+                }
+            else:
+                return {
+                    'collection_name': str(collection),
+                    'document_count': 0,
+                    'status': 'unknown'
+                }
+        except Exception as e:
+            logger.warning(f"Error processing collection {collection}: {e}")
+            return {
+                'collection_name': str(collection),
+                'document_count': 0,
+                'status': 'error'
+            }
+    
+    async def _client_collection_info(self, collection) -> Dict:
+        collection_name = collection.name if hasattr(collection, 'name') else str(collection)
+        try:
+            count = await asyncio.to_thread(collection.count) if hasattr(collection, 'count') else 0
+            return {
+                'collection_name': collection_name,
+                'document_count': count,
+                'status': 'active'
+            }
+        except Exception as e:
+            logger.warning(f"Error getting count for collection: {e}")
+            return {
+                'collection_name': collection_name,
+                'document_count': 0,
+                'status': 'error'
+            }
+    
     async def get_comprehensive_metrics(self) -> Dict:
         try:
             logger.info("Gathering comprehensive system metrics")
@@ -265,13 +842,14 @@ class IngestionPipeline:
                 logger.error(f"Collections fetch failed: {collections}")
                 collections = []
             
-            total_documents_in_vectors = sum(c.get('document_count', 0) for c in collections)
+            total_documents_in_vectors = await self._total_documents(collections)
+            documents, chunks, failed = self._stats_snapshot()
             
             metrics = {
-                'ingestion_stats': self.get_stats(),
+                'ingestion_stats': {'documents': documents, 'chunks': chunks, 'failed': failed},
                 'categories': {
                     'total_count': len(categories),
-                    'category_ids': [cat['category_id'] for cat in categories],
+                    'category_ids': _category_ids(categories),
                     'details': categories
                 },
                 'vector_collections': {
@@ -283,9 +861,9 @@ class IngestionPipeline:
                     'unique_categories': len(categories),
                     'active_collections': len(collections),
                     'total_stored_documents': total_documents_in_vectors,
-                    'current_session_documents': self._stats['documents'],
-                    'current_session_chunks': self._stats['chunks'],
-                    'current_session_failures': self._stats['failed']
+                    'current_session_documents': documents,
+                    'current_session_chunks': chunks,
+                    'current_session_failures': failed
                 }
             }
             
@@ -303,77 +881,133 @@ class IngestionPipeline:
         try:
             logger.info("Calculating category distribution")
             
-            if hasattr(self.vector_store, 'get_category_distribution'):
+            if self._vs_caps['get_category_distribution']:
                 distribution = await asyncio.to_thread(self.vector_store.get_category_distribution)
                 logger.info(f"Category distribution: {distribution}")
                 return distribution
             else:
                 collections_info = await self.get_vector_collections_info()
-                distribution = {}
-                for collection in collections_info:
-                    if 'collection_name' in collection and 'document_count' in collection:
-                        distribution[collection['collection_name']] = collection['document_count']
-                logger.info(f"Category distribution (from collections): {distribution}")
-                return distribution
+                return self._distribution_from(collections_info)
                 
         except Exception as e:
             logger.error(f"Failed to get category distribution: {e}", exc_info=True)
             return {}
     
-    async def get_system_info(self) -> Dict:
-        try:
-            logger.info("Fetching complete system information")
-            
-            categories_task = self.get_existing_categories()
-            collections_task = self.get_vector_collections_info()
-            distribution_task = self.get_category_distribution()
-            
+    def _distribution_from(self, collections_info: List[Dict]) -> Dict[str, int]:
+        distribution = {}
+        for collection in collections_info:
+            if 'collection_name' in collection and 'document_count' in collection:
+                distribution[collection['collection_name']] = collection['document_count']
+        logger.info(f"Category distribution (from collections): {distribution}")
+        return distribution
+    
+    async def get_total_document_count(self) -> int:
+        """Total stored vectors; skips per-collection counts when the store can answer directly"""
+        if self._vs_caps['total_document_count']:
+            return await self._total_documents(None)
+        return await self._total_documents(await self.get_vector_collections_info())
+    
+    async def _total_documents(self, collections: Optional[List[Dict]]) -> int:
+        if self._vs_caps['total_document_count']:
+            try:
+                return await asyncio.to_thread(self.vector_store.total_document_count)
+            except Exception as e:
+                logger.warning(f"total_document_count failed, summing collections: {e}")
+                if collections is None:
+                    collections = await self.get_vector_collections_info()
+        return _summarize_collections(collections)[0]
+    
+    def get_static_info(self) -> Dict:
+        if self._static_info is None:
+            provider = getattr(self.embedder, 'provider', None)
+            self._static_info = {
+                'embedding_model': getattr(provider, 'model_name', 'unknown'),
+                'embedding_dimension': self.embedder.get_dimension(),
+                'classification_model': getattr(self.classifier, 'model_id', 'unknown'),
+                'classification_table': getattr(self.classifier, 'table_name', 'unknown'),
+                'chunk_size': self.processor.chunk_size,
+                'chunk_overlap': self.processor.chunk_overlap
+            }
+        return self._static_info
+    
+    async def get_live_counts(self) -> Dict:
+        categories_task = self.get_existing_categories()
+        collections_task = self.get_vector_collections_info()
+        
+        if self._vs_caps['get_category_distribution']:
             categories, collections, distribution = await asyncio.gather(
                 categories_task,
                 collections_task,
-                distribution_task,
+                self.get_category_distribution(),
                 return_exceptions=True
             )
+        else:
+            categories, collections = await asyncio.gather(
+                categories_task,
+                collections_task,
+                return_exceptions=True
+            )
+            # Derive the distribution from the collections already fetched
+            distribution = {} if isinstance(collections, Exception) else self._distribution_from(collections)
+        
+        if isinstance(categories, Exception):
+            logger.error(f"Categories fetch failed: {categories}")
+            categories = []
+        if isinstance(collections, Exception):
+            logger.error(f"Collections fetch failed: {collections}")
+            collections = []
+        if isinstance(distribution, Exception):
+            logger.error(f"Distribution fetch failed: {distribution}")
+            distribution = {}
+        
+        return {
+            'categories': categories,
+            'collections': collections,
+            'distribution': distribution
+        }
+    
+    async def get_system_info(self) -> Dict:
+        try:
+            logger.info("Fetching complete system information")
             
-            if isinstance(categories, Exception):
-                logger.error(f"Categories fetch failed: {categories}")
-                categories = []
-            if isinstance(collections, Exception):
-                logger.error(f"Collections fetch failed: {collections}")
-                collections = []
-            if isinstance(distribution, Exception):
-                logger.error(f"Distribution fetch failed: {distribution}")
-                distribution = {}
+            live = await self.get_live_counts()
+            categories = live['categories']
+            collections = live['collections']
+            distribution = live['distribution']
             
-            total_documents_in_vectors = sum(c.get('document_count', 0) for c in collections)
+            total_documents_in_vectors, index_names = _summarize_collections(collections)
+            if self._vs_caps['total_document_count']:
+                total_documents_in_vectors = await self._total_documents(collections)
+            documents, chunks, failed = self._stats_snapshot()
             
             system_info = {
                 'timestamp': asyncio.get_event_loop().time(),
                 'status': 'success',
+                'config': self.get_static_info(),
                 'dynamodb': {
                     'total_categories': len(categories),
-                    'category_ids': [cat.get('category_id', 'unknown') for cat in categories],
+                    'category_ids': _category_ids(categories),
                     'categories': categories
                 },
                 'vector_database': {
                     'total_collections': len(collections),
                     'total_documents': total_documents_in_vectors,
-                    'index_names': [c.get('collection_name', 'unknown') for c in collections],
+                    'index_names': index_names,
                     'collections': collections,
                     'category_distribution': distribution
                 },
                 'ingestion_session': {
-                    'documents_processed': self._stats['documents'],
-                    'chunks_created': self._stats['chunks'],
-                    'failures': self._stats['failed']
+                    'documents_processed': documents,
+                    'chunks_created': chunks,
+                    'failures': failed
                 },
                 'summary': {
                     'total_categories': len(categories),
                     'total_collections': len(collections),
                     'total_stored_documents': total_documents_in_vectors,
-                    'session_documents': self._stats['documents'],
-                    'session_chunks': self._stats['chunks'],
-                    'session_failures': self._stats['failed']
+                    'session_documents': documents,
+                    'session_chunks': chunks,
+                    'session_failures': failed
                 }
             }
             
@@ -386,9 +1020,36 @@ class IngestionPipeline:
                 'timestamp': asyncio.get_event_loop().time(),
                 'status': 'error',
                 'error': str(e),
-                'ingestion_session': self._stats
+                'ingestion_session': self.get_stats()
             }
     
+    async def _batch_delete_categories(self, items: List[Dict]) -> int:
+        """Delete up to 25 category items with one BatchWriteItem, retrying unprocessed keys with backoff"""
+        table_name = self.classifier.table.name
+        client = self.classifier.table.meta.client
+        requests = [{'DeleteRequest': {'Key': {'category_id': item['category_id']}}} for item in items]
+        deleted_count = 0
+        attempt = 0
+        
+        try:
+            while requests:
+                response = await asyncio.to_thread(client.batch_write_item, RequestItems={table_name: requests})
+                unprocessed = response.get('UnprocessedItems', {}).get(table_name, [])
+                deleted_count += len(requests) - len(unprocessed)
+                requests = unprocessed
+                
+                if requests:
+                    attempt += 1
+                    if attempt > BATCH_WRITE_MAX_RETRIES:
+                        logger.error(f"Giving up on {len(requests)} unprocessed category deletions")
+                        break
+                    await asyncio.sleep(0.05 * (2 ** attempt))
+        except Exception as e:
+            logger.error(f"Batch delete of {len(items)} categories failed: {e}")
+        
+        logger.info(f"Deleted {deleted_count}/{len(items)} categories in batch")
+        return deleted_count
+    
     async def reset_all_data(self, confirm: bool = False) -> Dict:
         if not confirm:
             logger.warning("Reset operation called without confirmation")
@@ -399,6 +1060,11 @@ class IngestionPipeline:
         
         try:
             logger.warning("Starting DESTRUCTIVE reset operation - clearing all data")
+            self._invalidate_metrics_cache()
+            # Cached upload results would report re-uploads as done without re-indexing them
+            await asyncio.to_thread(clear_cached)
+            if hasattr(self.classifier, 'discard_pending_counts'):
+                self.classifier.discard_pending_counts()
             
             results = {
                 'status': 'in_progress',
@@ -420,20 +1086,22 @@ class IngestionPipeline:
                     }
                 elif hasattr(self.classifier, '_get_all_categories') and hasattr(self.classifier, '_delete_category'):
                     logger.info("Using fallback: deleting categories individually")
-                    categories = await self.classifier._get_all_categories()
-                    deleted_count = 0
+                    categories = await self.classifier._get_all_categories(refresh=True)
                     failed_deletions = []
                     
-                    for category in categories:
+                    async def delete_category(category) -> int:
+                        category_id = category.get('category_id')
                         try:
-                            category_id = category.get('category_id')
                             if category_id:
                                 await asyncio.to_thread(self.classifier._delete_category, category_id)
-                                deleted_count += 1
                                 logger.info(f"Deleted category: {category_id}")
+                                return 1
                         except Exception as e:
                             failed_deletions.append({'category_id': category_id, 'error': str(e)})
                             logger.error(f"Failed to delete category {category_id}: {e}")
+                        return 0
+                    
+                    deleted_count = sum(await self._gather_bounded(delete_category, categories, RESET_CONCURRENCY))
                     
                     results['dynamodb'] = {
                         'status': 'success' if not failed_deletions else 'partial_success',
@@ -449,16 +1117,14 @@ class IngestionPipeline:
                     try:
                         response = await asyncio.to_thread(self.classifier.table.scan)
                         items = response.get('Items', [])
-                        deleted_count = 0
                         
-                        for item in items:
-                            try:
-                                key = {'category_id': item['category_id']}
-                                await asyncio.to_thread(self.classifier.table.delete_item, Key=key)
-                                deleted_count += 1
-                                logger.info(f"Deleted category: {item['category_id']}")
-                            except Exception as e:
-                                logger.error(f"Failed to delete item {item.get('category_id', 'unknown')}: {e}")
+                        slices = [
+                            items[i:i + DYNAMODB_BATCH_WRITE_MAX]
+                            for i in range(0, len(items), DYNAMODB_BATCH_WRITE_MAX)
+                        ]
+                        deleted_count = sum(
+                            await self._gather_bounded(self._batch_delete_categories, slices, RESET_CONCURRENCY)
+                        )
                         
                         results['dynamodb'] = {
                             'status': 'success',
@@ -485,7 +1151,7 @@ class IngestionPipeline:
             try:
                 logger.info("Resetting vector database...")
                 
-                if hasattr(self.vector_store, 'reset_all_collections'):
+                if self._vs_caps['reset_all_collections']:
                     logger.info("Using vector_store.reset_all_collections() method")
                     vector_result = await asyncio.to_thread(self.vector_store.reset_all_collections)
                     results['vector_database'] = {
@@ -493,7 +1159,7 @@ class IngestionPipeline:
                         'message': 'All collections deleted from vector database',
                         'details': vector_result
                     }
-                elif hasattr(self.vector_store, 'delete_all'):
+                elif self._vs_caps['delete_all']:
                     logger.info("Using vector_store.delete_all() method")
                     vector_result = await asyncio.to_thread(self.vector_store.delete_all)
                     results['vector_database'] = {
@@ -501,15 +1167,15 @@ class IngestionPipeline:
                         'message': 'All data deleted from vector database (using delete_all)',
                         'details': vector_result
                     }
-                elif hasattr(self.vector_store, 'client') and hasattr(self.vector_store.client, 'list_collections'):
+                elif self._vs_caps['client.list_collections']:
                     logger.info("Using ChromaDB client collection deletion")
                     collections = await asyncio.to_thread(self.vector_store.client.list_collections)
                     deleted_collections = []
                     failed_deletions = []
                     
-                    for collection in collections:
+                    async def delete_client_collection(collection):
+                        collection_name = collection.name if hasattr(collection, 'name') else str(collection)
                         try:
-                            collection_name = collection.name if hasattr(collection, 'name') else str(collection)
                             logger.info(f"Attempting to delete collection: {collection_name}")
                             
                             try:
@@ -525,6 +1191,8 @@ class IngestionPipeline:
                             failed_deletions.append({'collection_name': collection_name, 'error': str(e)})
                             logger.error(f"Failed to delete collection {collection_name}: {e}")
                     
+                    await self._gather_bounded(delete_client_collection, collections, RESET_CONCURRENCY)
+                    
                     results['vector_database'] = {
                         'status': 'success' if not failed_deletions else 'partial_success',
                         'message': f'ChromaDB deletion completed: {len(deleted_collections)} successful, {len(failed_deletions)} failed',
@@ -534,18 +1202,18 @@ class IngestionPipeline:
                             'total_found': len(collections)
                         }
                     }
-                elif hasattr(self.vector_store, 'list_collections'):
+                elif self._vs_caps['list_collections']:
                     logger.info("Using vector_store.list_collections() method")
                     collections = await asyncio.to_thread(self.vector_store.list_collections)
                     deleted_collections = []
                     failed_deletions = []
                     
-                    for collection in collections:
+                    async def delete_store_collection(collection):
+                        collection_name = collection.name if hasattr(collection, 'name') else str(collection)
                         try:
-                            collection_name = collection.name if hasattr(collection, 'name') else str(collection)
                             logger.info(f"Attempting to delete collection: {collection_name}")
                             
-                            if hasattr(self.vector_store, 'delete_collection'):
+                            if self._vs_caps['delete_collection']:
                                 await asyncio.to_thread(self.vector_store.delete_collection, collection_name)
                                 deleted_collections.append(collection_name)
                                 logger.info(f"Successfully deleted collection: {collection_name}")
@@ -555,6 +1223,8 @@ class IngestionPipeline:
                             failed_deletions.append({'collection_name': collection_name, 'error': str(e)})
                             logger.error(f"Failed to delete collection {collection_name}: {e}")
                     
+                    await self._gather_bounded(delete_store_collection, collections, RESET_CONCURRENCY)
+                    
                     results['vector_database'] = {
                         'status': 'success' if not failed_deletions else 'partial_success',
                         'message': f'Vector store deletion completed: {len(deleted_collections)} successful, {len(failed_deletions)} failed',
@@ -570,6 +1240,8 @@ class IngestionPipeline:
                         'status': 'skipped',
                         'message': 'No reset methods available on vector store'
                     }
+                if self._vs_caps['clear_collection_cache']:
+                    self.vector_store.clear_collection_cache()
                 logger.info("Vector database reset completed")
             except Exception as e:
                 logger.error(f"Vector database reset failed: {e}", exc_info=True)
@@ -578,25 +1250,21 @@ class IngestionPipeline:
                     'error': str(e)
                 }
             
-            async with self._lock:
+            with self._lock:
                 self._stats = {'documents': 0, 'chunks': 0, 'failed': 0}
             results['ingestion_stats'] = {
                 'status': 'success',
                 'message': 'Session statistics reset'
             }
             
-            successful_operations = sum(1 for result in [results['dynamodb'], results['vector_database']] 
-                                      if result['status'] in ['success', 'skipped'])
-            partial_operations = sum(1 for result in [results['dynamodb'], results['vector_database']] 
-                                   if result['status'] == 'partial_success')
-            
-            if successful_operations == 2:
-                results['status'] = 'success'
-            elif successful_operations + partial_operations >= 1:
-                results['status'] = 'partial_success'
-            else:
-                results['status'] = 'error'
+            # 2 points per fully successful (or skipped) store, 1 per partial one
+            statuses = (results['dynamodb']['status'], results['vector_database']['status'])
+            score = sum(_RESET_STATUS_SCORES.get(status, 0) for status in statuses)
+            results['status'] = 'success' if score == 4 else ('partial_success' if score >= 1 else 'error')
             
+            self._invalidate_metrics_cache()
+            if hasattr(self.classifier, 'invalidate_categories_cache'):
+                self.classifier.invalidate_categories_cache()
             logger.warning(f"Reset operation completed with status: {results['status']}")
             return results
             
@@ -0,0 +1,55 @@
+import logging
+import math
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+_kernel = None
+
+
+def _get_kernel():
+    """Compile the Numba normalization kernel once; False when numba is unavailable"""
+    global _kernel
+    if _kernel is None:
+        try:
+            import numba
+            
+            @numba.njit(parallel=True, fastmath=True, cache=True)
+            def _l2_normalize(E):
+                for i in numba.prange(E.shape[0]):
+                    s = 0.0
+                    for j in range(E.shape[1]):
+                        s += E[i, j] * E[i, j]
+                    inv = 1.0 / math.sqrt(s + 1e-12)
+                    for j in range(E.shape[1]):
+                        E[i, j] *= inv
+            
+            _kernel = _l2_normalize
+        except ImportError:
+            logger.info("numba not installed, using numpy for embedding normalization")
+            _kernel = False
+    return _kernel
+
+
+def l2_normalize(embeddings: List[List[float]]):
+    """L2-normalize embedding rows into a (n, dim) float32 array; zero vectors stay zero"""
+    if len(embeddings) == 0:
+        return embeddings
+    
+    try:
+        import numpy as np
+    except ImportError:
+        logger.warning("numpy not installed, skipping embedding normalization. Install: pip install numpy")
+        return embeddings
+    
+    arr = np.asarray(embeddings, dtype=np.float32)
+    
+    kernel = _get_kernel()
+    if kernel:
+        kernel(arr)
+    else:
+        arr /= np.sqrt(np.einsum('ij,ij->i', arr, arr) + 1e-12)[:, None]
+    
+    # Rows stay float32 views; the vector store packs them into one matrix per insert
+    return arr
+
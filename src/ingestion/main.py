@@ -3,45 +3,60 @@ import logging
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from ingestion.config.settings import setup_logging, CONTENT_PREVIEW_MAX_CHARS
-from ingestion.core import create_ingestion_pipeline
+from .config.settings import setup_logging, CONTENT_PREVIEW_MAX_CHARS, INGEST_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
 
 async def ingest_files(file_paths: list[str]):
-    pipeline = create_ingestion_pipeline()
-    
-    tasks = [
-        ingest_single_file(pipeline, file_path)
-        for file_path in file_paths
-    ]
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    from .core import create_ingestion_pipeline
     
-    for file_path, result in zip(file_paths, results):
-        if isinstance(result, Exception):
-            logger.error(f"✗ Failed: {file_path} - {result}")
-        elif result:
-            logger.info(f"✓ Completed: {file_path} -> {result.get('category_id')}")
-        else:
-            logger.error(f"✗ Failed: {file_path}")
+    pipeline = create_ingestion_pipeline()
     
-    logger.info(f"Stats: {pipeline.get_stats()}")
+    try:
+        # Staged pipeline: previews/classification of later files overlap embedding of earlier ones.
+        # At most INGEST_CONCURRENCY files are in flight, which bounds resident chunks/embeddings.
+        results = await pipeline.ingest_stream(
+            file_paths,
+            preview_fn=extract_document_preview,
+            max_in_flight=INGEST_CONCURRENCY
+        )
+        
+        for file_path, result in zip(file_paths, results):
+            if result:
+                logger.info(f"✓ Completed: {file_path} -> {result.get('category_id')}")
+            else:
+                logger.error(f"✗ Failed: {file_path}")
+        
+        logger.info(f"Stats: {pipeline.get_stats()}")
+    finally:
+        await pipeline.aclose()
 
 
-async def ingest_single_file(pipeline, file_path: str):
-    logger.info(f"Ingesting: {file_path}")
-    
-    # Extract content preview
-    content_preview = extract_document_preview(file_path)
+class _Enough(Exception):
+    pass
+
+
+def _pdf_page_prefix(page, limit: int) -> str:
+    """Decode a page's text only until `limit` characters have been seen"""
+    parts = []
+    seen = 0
     
-    # Ingest to vector store (classification happens inside pipeline)
-    result = await pipeline.ingest_document(file_path, content_preview=content_preview)
+    def visitor(text, *args):
+        nonlocal seen
+        parts.append(text)
+        seen += len(text)
+        if seen >= limit:
+            raise _Enough
     
-    return result
+    try:
+        page.extract_text(visitor_text=visitor)
+    except _Enough:
+        pass
+    except Exception as e:
+        logger.debug("Streaming PDF preview failed, using full extract: %s", e)
+        return page.extract_text() or ""
+    return ''.join(parts)
 
 
 def extract_document_preview(file_path: str, max_chars: int = None) -> str:
@@ -61,14 +76,13 @@ def extract_document_preview(file_path: str, max_chars: int = None) -> str:
         
         elif file_extension == '.pdf':
             try:
-                import PyPDF2
+                from pypdf import PdfReader
                 with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
+                    # Only the first page is parsed; strict=False skips slow validation
+                    reader = PdfReader(f, strict=False)
                     if len(reader.pages) > 0:
-                        text = reader.pages[0].extract_text()
-                        lines = [line.strip() for line in text.split('\n') if line.strip()]
-                        preview = ' '.join(lines[:3])
-                        return preview[:200] if len(preview) > 200 else preview
+                        text = _pdf_page_prefix(reader.pages[0], max_chars * 2)
+                        return ' '.join(text.split())[:200]
             except Exception as e:
                 logger.warning(f"Could not extract PDF preview: {e}")
                 return ""
@@ -84,7 +98,7 @@ def main():
     setup_logging()
     
     if len(sys.argv) < 2:
-        logger.error("Usage: python main.py <file1> <file2> ...")
+        logger.error("Usage: ingest <file1> <file2> ...")
         return 1
     
     file_paths = sys.argv[1:]
@@ -1 +1 @@
-from .document import DocumentChunk
+from .document import ChunkMeta, DocumentChunk
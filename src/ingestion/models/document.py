@@ -1,7 +1,29 @@
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Tuple, Union
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
+class ChunkMeta:
+    chunk_index: int
+    chunk_size: int
+    
+    # Mapping-style access so chunk metadata can still be merged with dict.update()
+    def keys(self) -> Tuple[str, ...]:
+        return _CHUNK_META_KEYS
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in _CHUNK_META_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _CHUNK_META_KEYS else default
+
+
+_CHUNK_META_KEYS = tuple(f.name for f in fields(ChunkMeta))
+
+
+@dataclass(slots=True, frozen=True)
 class DocumentChunk:
     content: str
-    metadata: Dict[str, Any]
+    metadata: Union[ChunkMeta, Dict[str, Any]]
@@ -1,4 +1,4 @@
 from .processor import DocumentProcessor
 from .embedder import EmbeddingGenerator, EmbeddingFactory
-from .storage import VectorStore, VectorStoreFactory
+from .storage import VectorStore, VectorStoreFactory, new_vector_ids
 from .loaders import DocumentLoader, DocumentLoaderFactory
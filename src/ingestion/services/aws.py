@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAWSClients:
+    """
+    Lazily created aiobotocore clients, one set per running event loop.
+    
+    aiobotocore clients hold an aiohttp session bound to the loop that created
+    them, and the app drives the shared pipeline from several short-lived loops
+    (one asyncio.run per Streamlit action), so clients are cached per loop.
+    Entries pin their loop, so callers close() on each loop when they are done.
+    """
+    
+    def __init__(self, region_name: str, max_pool_connections: int = 50):
+        self.region_name = region_name
+        self.max_pool_connections = max_pool_connections
+        # Streamlit sessions drive loops from different threads, so both maps are guarded
+        self._lock = threading.Lock()
+        self._clients: Dict[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]] = {}
+        self._context_managers: Dict[asyncio.AbstractEventLoop, List] = {}
+        
+        try:
+            import aiobotocore.session
+            self._session = aiobotocore.session.get_session()
+        except ImportError:
+            logger.warning("aiobotocore not installed, AWS calls will use boto3 in worker threads. Install: pip install aiobotocore")
+            self._session = None
+    
+    @property
+    def available(self) -> bool:
+        return self._session is not None
+    
+    async def get(self, service_name: str):
+        """Client for service_name bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._clients:
+                self._prune_closed_loops()
+            clients = self._clients.setdefault(loop, {})
+            
+            # Concurrent callers await the same creation task instead of racing to build clients
+            task = clients.get(service_name)
+            if task is None:
+                task = loop.create_task(self._create(service_name))
+                clients[service_name] = task
+        return await task
+    
+    def _prune_closed_loops(self):
+        # Loops that ended without close() took their connections down with them; callers hold _lock
+        for loop in [loop for loop in self._clients if loop.is_closed()]:
+            del self._clients[loop]
+            self._context_managers.pop(loop, None)
+    
+    async def _create(self, service_name: str):
+        from aiobotocore.config import AioConfig
+        
+        cm = self._session.create_client(
+            service_name,
+            region_name=self.region_name,
+            config=AioConfig(max_pool_connections=self.max_pool_connections)
+        )
+        client = await cm.__aenter__()
+        with self._lock:
+            self._context_managers.setdefault(asyncio.get_running_loop(), []).append(cm)
+        logger.info(f"Created async {service_name} client")
+        return client
+    
+    async def close(self):
+        """Close the clients created on the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._clients.pop(loop, None)
+            context_managers = self._context_managers.pop(loop, [])
+        
+        for cm in context_managers:
+            try:
+                await cm.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Failed to close async AWS client: {e}")
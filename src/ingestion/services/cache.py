@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CONTENT_CACHE_DIR = os.path.expanduser(os.getenv('CONTENT_CACHE_DIR', '~/.docqa_content_cache'))
+CONTENT_CACHE_SIZE_LIMIT = 4 << 30
+MEMORY_CACHE_MAX_ENTRIES = 10_000
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    _hasher = None
+
+
+def content_hash(*parts: str) -> str:
+    """BLAKE3 digest of the parts (BLAKE2b when blake3 is not installed)"""
+    h = _hasher() if _hasher else hashlib.blake2b(digest_size=32)
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class ContentCache:
+    """
+    Content-addressed cache for embeddings and classifications.
+    
+    Embeddings are keyed by (model, hash(text)): a bounded in-memory LRU serves
+    repeats within the process, backed by float32 bytes on disk. Classifications
+    are keyed by hash(filename, preview) and stored as JSON on disk only.
+    diskcache is itself SQLite-backed, so it doubles as the persistent store.
+    """
+    
+    def __init__(
+        self,
+        directory: str = CONTENT_CACHE_DIR,
+        size_limit: int = CONTENT_CACHE_SIZE_LIMIT,
+        memory_entries: int = MEMORY_CACHE_MAX_ENTRIES
+    ):
+        self._memory: OrderedDict = OrderedDict()
+        self._memory_entries = memory_entries
+        self._memory_lock = threading.Lock()
+        self._cache = None
+        try:
+            import diskcache
+            self._cache = diskcache.Cache(directory, size_limit=size_limit)
+            logger.info(f"Content cache opened at {directory}")
+        except ImportError:
+            logger.warning("diskcache not installed, content cache is memory-only. Install: pip install diskcache")
+        except Exception as e:
+            logger.warning(f"Content cache unavailable at {directory}, using memory only: {e}")
+    
+    @property
+    def enabled(self) -> bool:
+        """True when the persistent (disk) tier is available"""
+        return self._cache is not None
+    
+    @staticmethod
+    def embedding_keys(texts: List[str], model_id: str) -> List[str]:
+        """Cache keys for texts, hashed once and reused for get and put"""
+        return [f"emb:{model_id}:{content_hash(text)}" for text in texts]
+    
+    def get_embeddings(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached float32 embedding per key, None for misses"""
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        disk_misses = []
+        with self._memory_lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    disk_misses.append(i)
+                else:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+        
+        if self._cache is None or not disk_misses:
+            return results
+        
+        found = []
+        try:
+            for i in disk_misses:
+                blob = self._cache.get(keys[i])
+                if blob is not None:
+                    results[i] = np.frombuffer(blob, dtype=np.float32)
+                    found.append(i)
+        except Exception as e:
+            logger.warning(f"Content cache lookup failed: {e}")
+        
+        if found:
+            self._remember([keys[i] for i in found], [results[i] for i in found])
+        return results
+    
+    def put_embeddings(self, keys: List[str], embeddings):
+        # Copies, so a cached row does not keep its whole batch matrix alive
+        rows = [np.array(embedding, dtype=np.float32) for embedding in embeddings]
+        self._remember(keys, rows)
+        
+        if self._cache is None:
+            return
+        try:
+            with self._cache.transact():
+                for key, row in zip(keys, rows):
+                    self._cache.set(key, row.tobytes())
+        except Exception as e:
+            logger.warning(f"Content cache write failed: {e}")
+    
+    def _remember(self, keys: List[str], rows: List[np.ndarray]):
+        with self._memory_lock:
+            for key, row in zip(keys, rows):
+                self._memory[key] = row
+                self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_entries:
+                self._memory.popitem(last=False)
+    
+    def get_classification(self, filename: str, content_preview: str) -> Optional[Dict]:
+        if self._cache is None:
+            return None
+        try:
+            cached = self._cache.get(f"cls:{content_hash(filename, content_preview)}")
+            return json.loads(cached) if cached is not None else None
+        except Exception as e:
+            logger.warning(f"Content cache lookup failed: {e}")
+            return None
+    
+    def put_classification(self, filename: str, content_preview: str, classification: Dict):
+        if self._cache is None:
+            return
+        try:
+            self._cache.set(f"cls:{content_hash(filename, content_preview)}", json.dumps(classification))
+        except Exception as e:
+            logger.warning(f"Content cache write failed: {e}")
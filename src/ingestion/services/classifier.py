@@ -1,38 +1,178 @@
+import asyncio
 import logging
 import json
-from typing import Dict, List, Optional
-import boto3
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 from botocore.exceptions import ClientError
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from ingestion.config.settings import (
+from .serialization import dumps, loads
+from ..config.settings import (
     CLASSIFICATION_TABLE_NAME,
     CLASSIFICATION_MODEL_ID,
     CLASSIFICATION_MAX_TOKENS,
     CLASSIFICATION_TEMPERATURE,
+    CONTENT_PREVIEW_MAX_CHARS,
     AWS_REGION
 )
 
 logger = logging.getLogger(__name__)
 
+PREVIEW_LENGTH_BUCKETS = (256, 512, 1024)
+# Output budget per document in a batch response (each JSON object is ~60-80 tokens)
+BATCH_TOKENS_PER_DOCUMENT = 100
+COUNT_FLUSH_THRESHOLD = 32
+COUNT_FLUSH_INTERVAL = 5.0
+# Category snapshots on local disk let new classifiers (other workers, next CLI run) skip the cold scan
+CATEGORY_SNAPSHOT_DIR = os.getenv('CATEGORY_SNAPSHOT_DIR', tempfile.gettempdir())
+CATEGORY_SNAPSHOT_TTL = 60.0
+
+# Low-level DynamoDB clients take typed attribute values; these request/response keys carry items
+_ITEM_REQUEST_KEYS = ('Key', 'Item', 'ExclusiveStartKey', 'ExpressionAttributeValues')
+_ITEM_RESPONSE_KEYS = ('Item', 'Attributes', 'LastEvaluatedKey')
+_SERIALIZER = None
+_DESERIALIZER = None
+
+
+def _get_codec():
+    # boto3 is imported on first use so CLI paths that never touch DynamoDB skip its import cost
+    global _SERIALIZER, _DESERIALIZER
+    if _SERIALIZER is None:
+        from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+        _SERIALIZER, _DESERIALIZER = TypeSerializer(), TypeDeserializer()
+    return _SERIALIZER, _DESERIALIZER
+
+
+def _snapshot_default(value):
+    # DynamoDB resources return numbers as Decimal and string sets as set
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _serialize(kwargs: Dict) -> Dict:
+    serializer, _ = _get_codec()
+    return {
+        key: {name: serializer.serialize(v) for name, v in value.items()} if key in _ITEM_REQUEST_KEYS else value
+        for key, value in kwargs.items()
+    }
+
+
+def _deserialize_item(item: Dict) -> Dict:
+    _, deserializer = _get_codec()
+    return {name: deserializer.deserialize(v) for name, v in item.items()}
+
+
+def _deserialize(response: Dict) -> Dict:
+    for key in _ITEM_RESPONSE_KEYS:
+        if key in response:
+            response[key] = _deserialize_item(response[key])
+    if 'Items' in response:
+        response['Items'] = [_deserialize_item(item) for item in response['Items']]
+    return response
+
+
+_PROMPT_HEADER = """You are a document classifier. Analyze the document carefully and classify it into the most specific and appropriate category.
+
+Document Information:"""
+
+# Static part of the single-document prompt, built once rather than per call
+_PROMPT_TAIL = """
+Classification Rules:
+1. **Read the filename and content carefully** to understand the document's specific purpose
+2. **Prefer creating a NEW category** if the document has a distinct, specific purpose (e.g., policy booklet, claims form, user guide)
+3. **Only reuse existing category** if it's an EXACT match in purpose (not just the same domain)
+4. **Be specific**: "policy booklet" is different from "user info", "claims" is different from "policy", etc.
+
+Domain Examples (create categories that match the specific document type):
+   
+Insurance:
+- insurance_policy_booklet (policy terms, coverage details, T&Cs)
+- insurance_user_info (customer personal data, contact info, demographics)
+- insurance_vehicle_policy (vehicle-specific insurance, auto coverage)
+- insurance_claims (claim forms, claim processing, claim reports)
+- insurance_keycare_policy (roadside assistance, key replacement coverage)
+
+Entertainment:
+- entertainment_movies, entertainment_music, entertainment_events
+
+Automobile:
+- automobile_specifications, automobile_maintenance, automobile_sales
+
+Corporate:
+- company_policies, company_hr_docs, company_financial
+
+Education:
+- education_curriculum, education_research, education_assessments
+
+Government:
+- govt_policy, govt_regulations, govt_legal
+
+General:
+- general_documents, technical_manuals, legal_contracts
+
+Format Requirements:
+- Category ID: domain_specific_type (lowercase_with_underscores)
+- Vector collection name: same as category_id
+- Be specific in the category name to reflect the document type
+
+Analyze the filename and content above, then respond with JSON only:
+{
+    "category_id": "insurance_policy_booklet",
+    "vector_collection_name": "insurance_policy_booklet",
+    "description": "Insurance policy booklets containing terms, conditions, and coverage details",
+    "keywords": ["policy", "booklet", "terms", "coverage", "conditions"]
+}"""
+
+
+def _categories_json(categories: List[Dict]) -> str:
+    """Existing categories as a compact JSON list (fewer prompt tokens than prose)"""
+    return json.dumps(
+        [{"id": c.get('category_id'), "desc": c.get('description'), "kw": list(c.get('keywords') or ())} for c in categories],
+        separators=(',', ':')
+    )
+
 
 class DocumentClassifier:
     
     def __init__(
         self,
         table_name: Optional[str] = None,
-        model_id: Optional[str] = None
+        model_id: Optional[str] = None,
+        bedrock_client=None,
+        dynamodb_resource=None,
+        content_cache=None,
+        async_clients=None
     ):
-        self.dynamodb = boto3.resource('dynamodb')
+        if bedrock_client is None or dynamodb_resource is None:
+            import boto3
+        self.dynamodb = dynamodb_resource or boto3.resource('dynamodb')
         self.table_name = table_name or CLASSIFICATION_TABLE_NAME
         self.table = self.dynamodb.Table(self.table_name)
         
-        self.bedrock = boto3.client('bedrock-runtime', region_name=AWS_REGION)
+        self.bedrock = bedrock_client or boto3.client('bedrock-runtime', region_name=AWS_REGION)
         self.model_id = model_id or CLASSIFICATION_MODEL_ID
         self.max_tokens = CLASSIFICATION_MAX_TOKENS
         self.temperature = CLASSIFICATION_TEMPERATURE
+        self.content_cache = content_cache
+        self.async_clients = async_clients
+        
+        # Categories only change through _create_category, so keep a local snapshot keyed by id.
+        # A thread lock (not asyncio.Lock) because the classifier is shared across event loops.
+        self._categories_cache: Optional[Dict[str, Dict]] = None
+        self._cache_lock = threading.Lock()
+        self._snapshot_path = os.path.join(CATEGORY_SNAPSHOT_DIR, f".classifier_cats_{self.table_name}.json")
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # Document counts are coalesced in memory and written as one ADD per category
+        self._pending_counts: Dict[str, int] = defaultdict(int)
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
         
         logger.info(f"Initialized classifier: table={self.table_name}, model={self.model_id}")
     
@@ -55,9 +195,88 @@ class DocumentClassifier:
         # Get existing categories
         categories = await self._get_all_categories()
         
-        # Classify using LLM
-        classification = await self._classify_with_llm(filename, content_preview, categories)
+        # Classify using LLM, unless this exact filename + preview was classified before
+        classification = await self._cached_classification(filename, content_preview)
+        if classification is None:
+            classification = await self._classify_once(filename, content_preview, categories)
+            await self._store_classification(filename, content_preview, classification)
+        
+        return await self._register_classification(classification)
+    
+    async def classify_many(self, documents: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """
+        Classify several documents with one LLM call per preview-length bucket
+        
+        Args:
+            documents: List of (filename, content_preview) tuples
+            
+        Returns:
+            Classifications in the same order as the input, shaped like classify_document
+        """
+        if not documents:
+            return []
         
+        categories = await self._get_all_categories()
+        
+        classifications: List[Optional[Dict]] = [
+            await self._cached_classification(filename, preview) for filename, preview in documents
+        ]
+        
+        buckets: Dict[int, List[int]] = {}
+        for idx, (_, preview) in enumerate(documents):
+            if classifications[idx] is not None:
+                continue
+            size = min(len(preview or ""), CONTENT_PREVIEW_MAX_CHARS)
+            bucket = next((b for b in PREVIEW_LENGTH_BUCKETS if size <= b), PREVIEW_LENGTH_BUCKETS[-1])
+            buckets.setdefault(bucket, []).append(idx)
+        
+        # Larger batches would truncate the JSON array at max_tokens
+        batch_size = max(1, self.max_tokens // BATCH_TOKENS_PER_DOCUMENT)
+        batches = []
+        for bucket, indices in buckets.items():
+            for start in range(0, len(indices), batch_size):
+                batches.append(indices[start:start + batch_size])
+            logger.info(f"Classifying {len(indices)} documents in {-(-len(indices) // batch_size)} "
+                       f"request(s) (preview bucket {bucket})")
+        
+        results = await asyncio.gather(*[
+            self._classify_batch_with_llm([documents[i] for i in batch], categories) for batch in batches
+        ])
+        for batch, batch_results in zip(batches, results):
+            for idx, classification in zip(batch, batch_results):
+                classifications[idx] = classification
+                await self._store_classification(*documents[idx], classification)
+        
+        return [await self._register_classification(c) for c in classifications]
+    
+    async def _classify_once(self, filename: str, content_preview: str, categories: List[Dict]) -> Dict[str, str]:
+        """Share one in-flight LLM call between concurrent requests for the same filename + preview"""
+        key = (id(asyncio.get_running_loop()), filename, content_preview)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._classify_with_llm(filename, content_preview, categories))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Callers mutate the result during registration, so each gets its own copy
+        return dict(await task)
+    
+    async def _cached_classification(self, filename: str, content_preview: str) -> Optional[Dict]:
+        if self.content_cache is None or not self.content_cache.enabled:
+            return None
+        return await asyncio.to_thread(self.content_cache.get_classification, filename, content_preview or "")
+    
+    async def _store_classification(self, filename: str, content_preview: str, classification: Dict):
+        if self.content_cache is None or not self.content_cache.enabled:
+            return
+        # The default is the error fallback, so caching it would pin a transient failure
+        if classification == self._get_default_classification():
+            return
+        await asyncio.to_thread(
+            self.content_cache.put_classification, filename, content_preview or "", dict(classification)
+        )
+    
+    async def _register_classification(self, classification: Dict) -> Dict[str, str]:
+        """Create or resolve the category for a classification and bump its count"""
         category_id = classification['category_id']
         
         # Check if category exists
@@ -78,25 +297,98 @@ class DocumentClassifier:
         
         return classification
     
-    async def _get_all_categories(self) -> List[Dict]:
-        """Get all existing categories from DynamoDB"""
+    async def _get_all_categories(self, refresh: bool = False) -> List[Dict]:
+        """Get all existing categories, scanning DynamoDB only on a cold or refreshed cache"""
+        if not refresh:
+            # Copy under the lock: _create_category inserts into the dict from other threads
+            with self._cache_lock:
+                if self._categories_cache is not None:
+                    return list(self._categories_cache.values())
+        
+        items = None if refresh else self._load_snapshot()
+        scanned = items is None
+        if scanned:
+            try:
+                items = await self._scan_categories()
+            except ClientError as e:
+                logger.error(f"Error getting categories: {e}")
+                return []
+        
+        with self._cache_lock:
+            self._categories_cache = {item['category_id']: item for item in items}
+            # Rewriting a loaded snapshot would bump its mtime and keep it from ever expiring
+            if scanned:
+                self._write_snapshot()
+        return items
+    
+    def _load_snapshot(self) -> Optional[List[Dict]]:
+        """Categories from a snapshot younger than CATEGORY_SNAPSHOT_TTL, else None"""
         try:
-            response = self.table.scan()
-            items = response.get('Items', [])
-            
-            while 'LastEvaluatedKey' in response:
-                response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-                items.extend(response.get('Items', []))
-            
+            if time.time() - os.path.getmtime(self._snapshot_path) > CATEGORY_SNAPSHOT_TTL:
+                return None
+            with open(self._snapshot_path, 'rb') as f:
+                items = loads(f.read())
+            logger.debug("Loaded %d categories from %s", len(items), self._snapshot_path)
             return items
-        except ClientError as e:
-            logger.error(f"Error getting categories: {e}")
-            return []
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable category snapshot: {e}")
+            return None
+    
+    def _write_snapshot(self):
+        """Persist the category cache; callers hold _cache_lock"""
+        if self._categories_cache is None:
+            return
+        try:
+            data = dumps(list(self._categories_cache.values()), default=_snapshot_default)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = f"{self._snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._snapshot_path)
+        except Exception as e:
+            logger.warning(f"Could not write category snapshot: {e}")
+    
+    async def _scan_categories(self) -> List[Dict]:
+        response = await self._ddb('scan')
+        items = response.get('Items', [])
+        
+        while 'LastEvaluatedKey' in response:
+            response = await self._ddb('scan', ExclusiveStartKey=response['LastEvaluatedKey'])
+            items.extend(response.get('Items', []))
+        
+        return items
+    
+    async def _ddb(self, operation: str, **kwargs) -> Dict:
+        """Run a table operation on the async client when available, else on boto3 in a worker thread"""
+        if self.async_clients is None or not self.async_clients.available:
+            method = getattr(self.table.meta.client, operation)
+            return await asyncio.to_thread(method, TableName=self.table_name, **kwargs)
+        
+        client = await self.async_clients.get('dynamodb')
+        response = await getattr(client, operation)(TableName=self.table_name, **_serialize(kwargs))
+        return _deserialize(response)
+    
+    def invalidate_categories_cache(self):
+        """Drop the category snapshot, e.g. after categories were deleted externally"""
+        with self._cache_lock:
+            self._categories_cache = None
+            try:
+                os.remove(self._snapshot_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove category snapshot: {e}")
     
     async def _get_category(self, category_id: str) -> Optional[Dict]:
         """Get specific category"""
+        cache = self._categories_cache
+        if cache is not None and category_id in cache:
+            return cache[category_id]
+        
         try:
-            response = self.table.get_item(Key={'category_id': category_id})
+            response = await self._ddb('get_item', Key={'category_id': category_id})
             return response.get('Item')
         except ClientError as e:
             logger.error(f"Error getting category {category_id}: {e}")
@@ -113,11 +405,17 @@ class DocumentClassifier:
                 'document_count': 0
             }
             
-            self.table.put_item(
+            await self._ddb(
+                'put_item',
                 Item=item,
                 ConditionExpression='attribute_not_exists(category_id)'
             )
             logger.info(f"Created category: {classification['category_id']}")
+            
+            with self._cache_lock:
+                if self._categories_cache is not None:
+                    self._categories_cache[item['category_id']] = item
+                    self._write_snapshot()
             return True
         except ClientError as e:
             if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
@@ -125,17 +423,49 @@ class DocumentClassifier:
             return False
     
     async def _increment_count(self, category_id: str) -> bool:
-        """Increment document count"""
-        try:
-            self.table.update_item(
-                Key={'category_id': category_id},
-                UpdateExpression='ADD document_count :inc',
-                ExpressionAttributeValues={':inc': 1}
+        """Queue a document count increment; flushes every COUNT_FLUSH_THRESHOLD docs or COUNT_FLUSH_INTERVAL seconds"""
+        with self._pending_lock:
+            self._pending_counts[category_id] += 1
+            due = (
+                sum(self._pending_counts.values()) >= COUNT_FLUSH_THRESHOLD
+                or time.monotonic() - self._last_flush >= COUNT_FLUSH_INTERVAL
             )
-            return True
-        except ClientError as e:
-            logger.error(f"Error incrementing count: {e}")
-            return False
+        
+        if due:
+            await self.flush_counts()
+        return True
+    
+    async def flush_counts(self):
+        """Write pending document counts with one concurrent UpdateItem per category"""
+        with self._pending_lock:
+            pending = dict(self._pending_counts)
+            self._pending_counts.clear()
+            self._last_flush = time.monotonic()
+        
+        if not pending:
+            return
+        
+        async def add(category_id: str, count: int):
+            try:
+                await self._ddb(
+                    'update_item',
+                    Key={'category_id': category_id},
+                    UpdateExpression='ADD document_count :inc',
+                    ExpressionAttributeValues={':inc': count}
+                )
+            except ClientError as e:
+                logger.error(f"Error incrementing count: {e}")
+                # Keep the increments for the next flush
+                with self._pending_lock:
+                    self._pending_counts[category_id] += count
+        
+        await asyncio.gather(*[add(category_id, count) for category_id, count in pending.items()])
+        logger.debug("Flushed document counts for %d categories", len(pending))
+    
+    def discard_pending_counts(self):
+        """Drop unflushed increments, e.g. before the categories table is reset"""
+        with self._pending_lock:
+            self._pending_counts.clear()
     
     async def _classify_with_llm(
         self,
@@ -161,6 +491,88 @@ class DocumentClassifier:
             logger.error(f"Classification error: {e}", exc_info=True)
             return self._get_default_classification()
     
+    async def _classify_batch_with_llm(
+        self,
+        documents: List[Tuple[str, str]],
+        existing_categories: List[Dict]
+    ) -> List[Dict[str, str]]:
+        """Classify a batch in a single Bedrock call, falling back to per-document calls"""
+        if len(documents) == 1:
+            filename, preview = documents[0]
+            return [await self._classify_with_llm(filename, preview, existing_categories)]
+        
+        try:
+            prompt = self._build_batch_prompt(documents, existing_categories)
+            response_text = await self._call_bedrock(prompt)
+            classifications = self._parse_batch_response(response_text, len(documents))
+            if classifications is not None:
+                return classifications
+        except Exception as e:
+            logger.error(f"Batch classification error: {e}", exc_info=True)
+        
+        logger.warning("Batch classification unusable, classifying documents individually")
+        return list(await asyncio.gather(*[
+            self._classify_once(filename, preview, existing_categories)
+            for filename, preview in documents
+        ]))
+    
+    def _build_batch_prompt(
+        self,
+        documents: List[Tuple[str, str]],
+        categories: List[Dict]
+    ) -> str:
+        """Build a prompt that classifies several documents at once"""
+        categories_text = f"\nExisting categories: {_categories_json(categories)}\n" if categories else ""
+        
+        documents_text = ""
+        for i, (filename, preview) in enumerate(documents, 1):
+            preview = (preview or "")[:CONTENT_PREVIEW_MAX_CHARS]
+            documents_text += f"\n{i}. Filename: {filename}\n   First 5 lines:\n{preview}\n"
+        
+        return f"""You are a document classifier. Classify each of the following documents into the most specific and appropriate category.
+{categories_text}
+Documents:{documents_text}
+Classification Rules:
+1. Prefer creating a NEW category if a document has a distinct, specific purpose
+2. Only reuse an existing category if it's an EXACT match in purpose
+3. Category ID: domain_specific_type (lowercase_with_underscores); vector collection name: same as category_id
+
+Return a JSON array only, with exactly {len(documents)} objects in the same order as the documents:
+[
+    {{
+        "category_id": "insurance_policy_booklet",
+        "vector_collection_name": "insurance_policy_booklet",
+        "description": "Insurance policy booklets containing terms, conditions, and coverage details",
+        "keywords": ["policy", "booklet", "terms", "coverage", "conditions"]
+    }}
+]"""
+    
+    def _parse_batch_response(self, response: str, expected: int) -> Optional[List[Dict[str, str]]]:
+        """Parse a JSON array response; returns None if it cannot be used"""
+        try:
+            start = response.find('[')
+            end = response.rfind(']') + 1
+            
+            if start == -1 or end == 0:
+                logger.warning("No JSON array found in batch response")
+                return None
+            
+            data = json.loads(response[start:end])
+            
+            required_fields = ['category_id', 'vector_collection_name', 'description']
+            if (
+                not isinstance(data, list)
+                or len(data) != expected
+                or not all(isinstance(item, dict) and all(f in item for f in required_fields) for item in data)
+            ):
+                logger.warning(f"Batch response malformed: expected {expected} complete classifications")
+                return None
+            
+            return data
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON decode error in batch response: {e}")
+            return None
+    
     def _build_prompt(
         self,
         filename: str,
@@ -168,66 +580,10 @@ class DocumentClassifier:
         categories: List[Dict]
     ) -> str:
         """Build classification prompt"""
-        categories_text = ""
-        if categories:
-            categories_text = "\n\nExisting Categories:\n"
-            for cat in categories:
-                keywords = ", ".join(cat.get('keywords', []))
-                categories_text += f"- {cat.get('category_id')}: {cat.get('description')} [Keywords: {keywords}]\n"
-        
         content_section = f"\n- First 5 lines:\n{content_preview}" if content_preview else ""
+        categories_section = f"\n- Existing categories: {_categories_json(categories)}" if categories else ""
         
-        return f"""You are a document classifier. Analyze the document carefully and classify it into the most specific and appropriate category.
-
-Document Information:
-- Filename: {filename}{content_section}
-{categories_text}
-
-Classification Rules:
-1. **Read the filename and content carefully** to understand the document's specific purpose
-2. **Prefer creating a NEW category** if the document has a distinct, specific purpose (e.g., policy booklet, claims form, user guide)
-3. **Only reuse existing category** if it's an EXACT match in purpose (not just the same domain)
-4. **Be specific**: "policy booklet" is different from "user info", "claims" is different from "policy", etc.
-
-Domain Examples (create categories that match the specific document type):
-   
-Insurance:
-- insurance_policy_booklet (policy terms, coverage details, T&Cs)
-- insurance_user_info (customer personal data, contact info, demographics)
-- insurance_vehicle_policy (vehicle-specific insurance, auto coverage)
-- insurance_claims (claim forms, claim processing, claim reports)
-- insurance_keycare_policy (roadside assistance, key replacement coverage)
-
-Entertainment:
-- entertainment_movies, entertainment_music, entertainment_events
-
-Automobile:
-- automobile_specifications, automobile_maintenance, automobile_sales
-
-Corporate:
-- company_policies, company_hr_docs, company_financial
-
-Education:
-- education_curriculum, education_research, education_assessments
-
-Government:
-- govt_policy, govt_regulations, govt_legal
-
-General:
-- general_documents, technical_manuals, legal_contracts
-
-Format Requirements:
-- Category ID: domain_specific_type (lowercase_with_underscores)
-- Vector collection name: same as category_id
-- Be specific in the category name to reflect the document type
-
-Analyze the filename "{filename}" and content, then respond with JSON only:
-{{{{
-    "category_id": "insurance_policy_booklet",
-    "vector_collection_name": "insurance_policy_booklet",
-    "description": "Insurance policy booklets containing terms, conditions, and coverage details",
-    "keywords": ["policy", "booklet", "terms", "coverage", "conditions"]
-}}}}"""
+        return f"{_PROMPT_HEADER}\n- Filename: {filename}{content_section}{categories_section}\n{_PROMPT_TAIL}"
     
     async def _call_bedrock(self, prompt: str) -> str:
         """Call Bedrock API"""
@@ -239,15 +595,21 @@ Analyze the filename "{filename}" and content, then respond with JSON only:
                 "messages": [{"role": "user", "content": prompt}]
             }
             
-            response = self.bedrock.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
-            )
-
-            print(request_body)
-            print(response)
+            if self.async_clients is not None and self.async_clients.available:
+                client = await self.async_clients.get('bedrock-runtime')
+                response = await client.invoke_model(
+                    modelId=self.model_id,
+                    body=dumps(request_body)
+                )
+                response_body = loads(await response['body'].read())
+            else:
+                response = await asyncio.to_thread(
+                    self.bedrock.invoke_model,
+                    modelId=self.model_id,
+                    body=dumps(request_body)
+                )
+                response_body = loads(response['body'].read())
             
-            response_body = json.loads(response['body'].read())
             return response_body['content'][0]['text']
         except Exception as e:
             logger.error(f"Bedrock error: {e}")
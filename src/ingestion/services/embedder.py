@@ -1,10 +1,10 @@
 import asyncio
-import json
-import boto3
 import logging
+import numpy as np
 from abc import ABC, abstractmethod
 from typing import List
 from concurrent.futures import ThreadPoolExecutor
+from .serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +12,13 @@ logger = logging.getLogger(__name__)
 class EmbeddingProvider(ABC):
     
     @abstractmethod
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Embeddings as a (len(texts), dimension) float32 array"""
         pass
     
     @abstractmethod
-    async def generate_embeddings_async(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings_async(self, texts: List[str]) -> np.ndarray:
+        """Embeddings as a (len(texts), dimension) float32 array"""
         pass
     
     @abstractmethod
@@ -33,36 +35,182 @@ class BedrockEmbedding(EmbeddingProvider):
         'cohere.embed-multilingual-v3': 1024
     }
     
-    def __init__(self, model_name: str, region_name: str = "us-east-1", batch_size: int = 10, max_workers: int = 5):
+    COHERE_MAX_TEXTS = 96
+    
+    def __init__(self, model_name: str, region_name: str = "us-east-1", batch_size: int = 10, max_workers: int = 5, bedrock_client=None, content_cache=None, async_clients=None, max_in_flight: int = 50):
         self.model_name = model_name
-        self.bedrock = boto3.client('bedrock-runtime', region_name=region_name)
+        self.content_cache = content_cache
+        self.async_clients = async_clients
+        self.max_in_flight = max_in_flight
+        if bedrock_client is None:
+            import boto3
+            bedrock_client = boto3.client('bedrock-runtime', region_name=region_name)
+        self.bedrock = bedrock_client
         self.dimension = self.DIMENSIONS.get(model_name, 1536)
+        # Models missing from DIMENSIONS get their real dimension from the first response
+        self._dimension_known = model_name in self.DIMENSIONS
         self.batch_size = batch_size
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         logger.info(f"Initialized Bedrock: {model_name} in {region_name} (batch_size={batch_size}, workers={max_workers})")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        return [self._embed_text(text) for text in texts]
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        size = self._request_batch_size()
+        if texts and not self._dimension_known:
+            return self._learn_dimension(
+                np.concatenate([self._embed_batch(texts[i:i + size]) for i in range(0, len(texts), size)])
+            )
+        
+        out = self._allocate(len(texts))
+        for i in range(0, len(texts), size):
+            out[i:i + size] = self._embed_batch(texts[i:i + size])
+        return out
     
-    async def generate_embeddings_async(self, texts: List[str]) -> List[List[float]]:
-        if len(texts) <= self.batch_size:
-            tasks = [asyncio.to_thread(self._embed_text, text) for text in texts]
-            return await asyncio.gather(*tasks)
+    async def generate_embeddings_async(self, texts: List[str]) -> np.ndarray:
+        if self.content_cache is None:
+            return await self._generate_embeddings_async(texts)
+        
+        # Serve repeated content from the memory/disk cache; only misses go to Bedrock
+        keys = self.content_cache.embedding_keys(texts, self.model_name)
+        cached = await asyncio.to_thread(self.content_cache.get_embeddings, keys)
+        misses = [i for i, embedding in enumerate(cached) if embedding is None]
+        
+        if len(misses) == len(texts):
+            out = await self._generate_embeddings_async(texts)
+            await asyncio.to_thread(self.content_cache.put_embeddings, keys, out)
+            return out
+        
+        if not self._dimension_known:
+            self._learn_dimension(next(e for e in cached if e is not None)[None, :])
+        
+        out = self._allocate(len(texts))
+        for i, embedding in enumerate(cached):
+            if embedding is not None:
+                out[i] = embedding
+        
+        if misses:
+            fresh = await self._generate_embeddings_async([texts[i] for i in misses])
+            out[misses] = fresh
+            await asyncio.to_thread(self.content_cache.put_embeddings, [keys[i] for i in misses], fresh)
+        
+        logger.debug("Content cache: %d/%d embeddings reused", len(texts) - len(misses), len(texts))
+        return out
+    
+    async def _generate_embeddings_async(self, texts: List[str]) -> np.ndarray:
+        size = self._request_batch_size()
+        
+        if self.async_clients is not None and self.async_clients.available:
+            # Native async HTTP: no thread hop, in-flight requests bounded per call
+            client = await self.async_clients.get('bedrock-runtime')
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            
+            async def embed(start: int) -> np.ndarray:
+                return await self._embed_batch_aio(client, semaphore, texts[start:start + size])
+        else:
+            async def embed(start: int) -> np.ndarray:
+                return await self._embed_batch_async(texts[start:start + size])
         
-        all_embeddings = []
-        for i in range(0, len(texts), self.batch_size):
-            batch = texts[i:i + self.batch_size]
-            tasks = [asyncio.to_thread(self._embed_text, text) for text in batch]
-            batch_embeddings = await asyncio.gather(*tasks)
-            all_embeddings.extend(batch_embeddings)
-            logger.debug(f"Processed batch {i//self.batch_size + 1}: {len(batch)} embeddings")
+        starts = range(0, len(texts), size)
+        if texts and not self._dimension_known:
+            return self._learn_dimension(np.concatenate(await asyncio.gather(*[embed(i) for i in starts])))
         
-        return all_embeddings
+        out = self._allocate(len(texts))
+        
+        async def fill(start: int):
+            out[start:start + size] = await embed(start)
+        
+        await asyncio.gather(*[fill(i) for i in starts])
+        return out
+    
+    def _allocate(self, n: int) -> np.ndarray:
+        # Uninitialized: every row is written, or the request failed and the error propagates
+        return np.empty((n, self.dimension), dtype=np.float32)
+    
+    def _learn_dimension(self, rows: np.ndarray) -> np.ndarray:
+        """Adopt the dimension of the first rows returned for a model not in DIMENSIONS"""
+        if not self._dimension_known:
+            self.dimension = rows.shape[1]
+            self._dimension_known = True
+            logger.info(f"Embedding dimension for {self.model_name}: {self.dimension}")
+        return rows
     
     def get_dimension(self) -> int:
         return self.dimension
     
-    def _embed_text(self, text: str) -> List[float]:
+    def _is_multi_input(self) -> bool:
+        return self.model_name.startswith('cohere')
+    
+    def _request_batch_size(self) -> int:
+        # Cohere takes up to 96 texts per request; Titan is single-input, so slices only group the fan-out
+        return self.COHERE_MAX_TEXTS if self._is_multi_input() else self.batch_size
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        if self._is_multi_input():
+            return self._embed_multi(texts)
+        return np.stack([self._embed_text(text) for text in texts]) if texts else self._allocate(0)
+    
+    async def _embed_batch_async(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        if self._is_multi_input():
+            return await loop.run_in_executor(self.executor, self._embed_multi, texts)
+        # The executor's max_workers bounds in-flight Titan calls across all batches
+        rows = await asyncio.gather(*[
+            loop.run_in_executor(self.executor, self._embed_text, text) for text in texts
+        ])
+        return np.stack(rows) if rows else self._allocate(0)
+    
+    async def _embed_batch_aio(self, client, semaphore: asyncio.Semaphore, texts: List[str]) -> np.ndarray:
+        if self._is_multi_input():
+            try:
+                response = await self._invoke_aio(
+                    client, semaphore, dumps({"texts": texts, "input_type": "search_document"})
+                )
+                embeddings = response.get('embeddings') or []
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"Expected {len(texts)} embeddings from {self.model_name}, got {len(embeddings)}")
+                return np.asarray(embeddings, dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Bedrock batch embedding of {len(texts)} texts failed: {e}")
+                raise
+        
+        rows = await asyncio.gather(*[self._embed_text_aio(client, semaphore, text) for text in texts])
+        return np.stack(rows) if rows else self._allocate(0)
+    
+    async def _embed_text_aio(self, client, semaphore: asyncio.Semaphore, text: str) -> np.ndarray:
+        try:
+            response = await self._invoke_aio(client, semaphore, self._build_request_body(text))
+            return self._extract_embedding(response)
+        except Exception as e:
+            logger.error(f"Bedrock embedding failed: {e}")
+            raise
+    
+    async def _invoke_aio(self, client, semaphore: asyncio.Semaphore, body: bytes) -> dict:
+        async with semaphore:
+            response = await client.invoke_model(
+                modelId=self.model_name,
+                body=body,
+                contentType="application/json",
+                accept="application/json"
+            )
+            return loads(await response['body'].read())
+    
+    def _embed_multi(self, texts: List[str]) -> np.ndarray:
+        try:
+            response = self.bedrock.invoke_model(
+                modelId=self.model_name,
+                body=dumps({"texts": texts, "input_type": "search_document"}),
+                contentType="application/json",
+                accept="application/json"
+            )
+            embeddings = loads(response['body'].read()).get('embeddings') or []
+            if len(embeddings) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings from {self.model_name}, got {len(embeddings)}")
+            return np.asarray(embeddings, dtype=np.float32)
+            
+        except Exception as e:
+            logger.error(f"Bedrock batch embedding of {len(texts)} texts failed: {e}")
+            raise
+    
+    def _embed_text(self, text: str) -> np.ndarray:
         try:
             body = self._build_request_body(text)
             response = self.bedrock.invoke_model(
@@ -71,18 +219,18 @@ class BedrockEmbedding(EmbeddingProvider):
                 contentType="application/json",
                 accept="application/json"
             )
-            return self._extract_embedding(json.loads(response['body'].read()))
+            return self._extract_embedding(loads(response['body'].read()))
             
         except Exception as e:
             logger.error(f"Bedrock embedding failed: {e}")
-            return [0.0] * self.dimension
+            raise
     
-    def _build_request_body(self, text: str) -> str:
+    def _build_request_body(self, text: str) -> bytes:
         if self.model_name.startswith('cohere'):
-            return json.dumps({"texts": [text], "input_type": "search_document"})
-        return json.dumps({"inputText": text})
+            return dumps({"texts": [text], "input_type": "search_document"})
+        return dumps({"inputText": text})
     
-    def _extract_embedding(self, response: dict) -> List[float]:
+    def _extract_embedding(self, response: dict) -> np.ndarray:
         if self.model_name.startswith('cohere'):
             embedding = response.get('embeddings', [[]])[0]
         else:
@@ -91,23 +239,24 @@ class BedrockEmbedding(EmbeddingProvider):
         if not embedding:
             raise ValueError(f"No embedding in response from {self.model_name}")
         
-        return embedding
+        return np.asarray(embedding, dtype=np.float32)
 
 class EmbeddingFactory:
     
+    PROVIDERS = {
+        'bedrock': BedrockEmbedding
+    }
+    
     @staticmethod
-    def create(provider: str, **kwargs) -> EmbeddingProvider:
-        provider_lower = provider.lower()
-        
-        if provider_lower == 'bedrock':
-            model_name = kwargs.get('model_name', 'amazon.titan-embed-text-v1')
-            region_name = kwargs.get('region_name', 'us-east-1')
-            batch_size = kwargs.get('batch_size', 10)
-            max_workers = kwargs.get('max_workers', 5)
-            return BedrockEmbedding(model_name, region_name, batch_size, max_workers)
-        
-        else:
+    def get_class(provider: str) -> type:
+        try:
+            return EmbeddingFactory.PROVIDERS[provider.lower()]
+        except KeyError:
             raise ValueError(f"Unsupported embedding provider: {provider}")
+    
+    @staticmethod
+    def create(provider: str, **kwargs) -> EmbeddingProvider:
+        return EmbeddingFactory.get_class(provider)(**kwargs)
 
 
 class EmbeddingGenerator:
@@ -115,10 +264,10 @@ class EmbeddingGenerator:
     def __init__(self, provider: EmbeddingProvider):
         self.provider = provider
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         return self.provider.generate_embeddings(texts)
     
-    async def generate_embeddings_async(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings_async(self, texts: List[str]) -> np.ndarray:
         return await self.provider.generate_embeddings_async(texts)
     
     def get_dimension(self) -> int:
@@ -1,59 +1,76 @@
+import codecs
+import io
 import logging
+import mmap
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Dict, Iterator, Tuple
 
 logger = logging.getLogger(__name__)
 
 
 class DocumentLoader(ABC):
     
+    # Lower-case file extensions this loader handles
+    EXTENSIONS: Tuple[str, ...] = ()
+    
     @abstractmethod
     def load(self, file_path: Path) -> str:
         pass
     
-    @abstractmethod
     def supports(self, file_extension: str) -> bool:
-        pass
+        return file_extension.lower() in self.EXTENSIONS
 
 
-class TxtLoader(DocumentLoader):
+class TextFileLoader(DocumentLoader):
     
     def load(self, file_path: Path) -> str:
         return file_path.read_text(encoding='utf-8').strip()
     
-    def supports(self, file_extension: str) -> bool:
-        return file_extension.lower() == '.txt'
+    def iter_text(self, file_path: Path, window_bytes: int = 1 << 16) -> Iterator[str]:
+        """Yield the (unstripped) text in decoded windows of about `window_bytes` via mmap"""
+        with open(file_path, 'rb') as f:
+            # mmap cannot map an empty file
+            if f.seek(0, io.SEEK_END) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Same universal-newline handling as read_text(); both decoders carry partial input across windows
+                decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+                for offset in range(0, len(mm), window_bytes):
+                    text = decoder.decode(mm[offset:offset + window_bytes])
+                    if text:
+                        yield text
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
 
 
-class MarkdownLoader(DocumentLoader):
+class TxtLoader(TextFileLoader):
     
-    def load(self, file_path: Path) -> str:
-        return file_path.read_text(encoding='utf-8').strip()
+    EXTENSIONS = ('.txt',)
+
+
+class MarkdownLoader(TextFileLoader):
     
-    def supports(self, file_extension: str) -> bool:
-        return file_extension.lower() in ['.md', '.markdown']
+    EXTENSIONS = ('.md', '.markdown')
 
 
 class PdfLoader(DocumentLoader):
     
+    EXTENSIONS = ('.pdf',)
+    
     def load(self, file_path: Path) -> str:
         try:
-            import PyPDF2
-            text = []
+            from pypdf import PdfReader
             with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text.append(page.extract_text())
-            return '\n'.join(text).strip()
+                reader = PdfReader(file, strict=False)
+                return '\n'.join(page.extract_text() or '' for page in reader.pages).strip()
         except ImportError:
-            logger.error("PyPDF2 not installed. Install: pip install PyPDF2")
+            logger.error("pypdf not installed. Install: pip install pypdf")
             raise
         except Exception as e:
             logger.error(f"PDF loading failed: {e}")
             raise
-    
-    def supports(self, file_extension: str) -> bool:
-        return file_extension.lower() == '.pdf'
 
 
 class DocumentLoaderFactory:
@@ -64,15 +81,29 @@ class DocumentLoaderFactory:
             MarkdownLoader(),
             PdfLoader()
         ]
+        self._by_ext: Dict[str, DocumentLoader] = {}
+        for loader in self.loaders:
+            self._index(loader)
     
     def get_loader(self, file_path: Path) -> DocumentLoader:
         extension = file_path.suffix
         
+        loader = self._by_ext.get(extension.lower())
+        if loader is not None:
+            return loader
+        
+        # Loaders that override supports() without declaring EXTENSIONS are only found by scanning
         for loader in self.loaders:
             if loader.supports(extension):
+                self._by_ext[extension.lower()] = loader
                 return loader
-        
         raise ValueError(f"No loader found for file type: {extension}")
     
     def register_loader(self, loader: DocumentLoader):
         self.loaders.append(loader)
+        self._index(loader)
+    
+    def _index(self, loader: DocumentLoader):
+        # Earlier registrations win, matching the old first-match scan
+        for extension in loader.EXTENSIONS:
+            self._by_ext.setdefault(extension, loader)
@@ -1,18 +1,23 @@
 import logging
 from pathlib import Path
-from typing import List
-from ingestion.models import DocumentChunk
-from ingestion.services.loaders import DocumentLoaderFactory
+from typing import Iterable, List, Optional
+from ..models import ChunkMeta, DocumentChunk
+from .loaders import DocumentLoaderFactory
 
 logger = logging.getLogger(__name__)
 
+_LOADER_FACTORY = DocumentLoaderFactory()
+
+# Text files above this size are decoded and split window by window instead of loaded whole
+STREAM_THRESHOLD_BYTES = 8 << 20
+
 
 class DocumentProcessor:
     
-    def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50):
+    def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50, loader_factory: Optional[DocumentLoaderFactory] = None):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.loader_factory = DocumentLoaderFactory()
+        self.loader_factory = loader_factory or _LOADER_FACTORY
     
     def process_document(self, file_path: str) -> List[DocumentChunk]:
         path = Path(file_path)
@@ -21,17 +26,18 @@ class DocumentProcessor:
             raise FileNotFoundError(f"File not found: {file_path}")
         
         loader = self.loader_factory.get_loader(path)
-        content = loader.load(path)
         
-        if not content:
-            return []
+        if hasattr(loader, 'iter_text') and path.stat().st_size > STREAM_THRESHOLD_BYTES:
+            window_bytes = max(self.chunk_size * 4, 1 << 16)
+            chunks = self._split_stream(loader.iter_text(path, window_bytes))
+        else:
+            content = loader.load(path)
+            if not content:
+                return []
+            chunks = self._split_text(content)
         
-        chunks = self._split_text(content)
         return [
-            DocumentChunk(
-                content=chunk,
-                metadata={'chunk_index': i, 'chunk_size': len(chunk)}
-            )
+            DocumentChunk(content=chunk, metadata=ChunkMeta(i, len(chunk)))
             for i, chunk in enumerate(chunks)
         ]
     
@@ -40,17 +46,71 @@ class DocumentProcessor:
             return []
         
         chunks = []
+        text_len = len(text)
         start = 0
         
-        while start < len(text):
-            end = start + self.chunk_size
-            chunk = text[start:end].strip()
-            if chunk:
+        while start < text_len:
+            end = min(start + self.chunk_size, text_len)
+            if end < text_len:
+                end = self._snap_end(text, start, end)
+            
+            # Loaders already strip the document, so slices are kept as-is (one allocation per chunk)
+            chunk = text[start:end]
+            if not chunk.isspace():
                 chunks.append(chunk)
             
-            if end >= len(text):
+            if end >= text_len:
                 break
             
-            start += self.chunk_size - self.chunk_overlap
+            start = self._next_start(text, start, end)
+        
+        return chunks
+    
+    def _snap_end(self, text: str, start: int, end: int) -> int:
+        # Snap to the last space in the back half of the window so words are not split
+        brk = text.rfind(' ', start + self.chunk_size // 2, end)
+        return brk if brk != -1 else end
+    
+    def _next_start(self, text: str, start: int, end: int) -> int:
+        """
+        Start of the chunk after text[start:end]: chunk_overlap back from end, but at least
+        chunk_size - chunk_overlap past start (and never past end), moved up to a word start
+        """
+        nxt = min(max(end - self.chunk_overlap, start + max(1, self.chunk_size - self.chunk_overlap)), end)
+        if nxt < end and not text[nxt - 1].isspace():
+            brk = text.find(' ', nxt, end)
+            if brk != -1:
+                nxt = brk + 1
+        # A snapped end sits on the separating space; do not open the next chunk with it
+        if nxt == end and text[nxt:nxt + 1] == ' ':
+            nxt += 1
+        return nxt
+    
+    def _split_stream(self, windows: Iterable[str]) -> List[str]:
+        """
+        Same chunks as _split_text(full_text.strip()), but only the unconsumed
+        tail of the text plus one incoming window is held in memory.
+        """
+        chunks = []
+        buf = ''
+        start = 0
+        
+        for piece in windows:
+            if not buf:
+                piece = piece.lstrip()
+                if not piece:
+                    continue
+            buf = buf[start:] + piece
+            start = 0
+            content_len = len(buf.rstrip())
+            
+            # A full window can be cut only while non-space text follows it, i.e. it is not the last chunk
+            while content_len > start + self.chunk_size:
+                end = self._snap_end(buf, start, start + self.chunk_size)
+                chunk = buf[start:end]
+                if not chunk.isspace():
+                    chunks.append(chunk)
+                start = self._next_start(buf, start, end)
         
+        chunks.extend(self._split_text(buf[start:].rstrip()))
         return chunks
@@ -0,0 +1,21 @@
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data) -> Any:
+    """Parse JSON from bytes or str, with orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (request bodies accept bytes as-is)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(obj, separators=(',', ':'), default=default).encode('utf-8')
@@ -1,10 +1,105 @@
+import asyncio
+import gzip
 import logging
-import uuid
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Vectors per collection.upsert() request; larger payloads stall the Chroma server or hit request size limits
+BULK_BATCH_SIZE = 256
+# Concurrent sub-batch requests per async bulk insert; gains flatten out beyond a handful
+ASYNC_MAX_IN_FLIGHT = 8
+# Concurrent collection.count() requests in get_collections_info
+COUNT_MAX_WORKERS = 16
+# Level 1 is the fast end of gzip and still shrinks JSON-float embeddings about 3x
+GZIP_COMPRESS_LEVEL = 1
+
+
+def _accepts_ndarray_embeddings() -> bool:
+    # Clients that normalize embeddings take ndarrays as-is; older ones validate plain lists only
+    try:
+        from chromadb.api.types import normalize_embeddings  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _gzip_body(body, headers, min_bytes: int) -> Optional[bytes]:
+    """Compressed body when it is large enough and not already encoded, else None"""
+    if not body or 'content-encoding' in {k.lower() for k in headers}:
+        return None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if not isinstance(body, bytes) or len(body) < min_bytes:
+        return None
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+
+
+def _enable_request_compression(client, min_bytes: int) -> bool:
+    """
+    Gzip large request bodies sent by a chromadb HttpClient.
+    
+    Older clients talk through requests.Session, newer ones through httpx.Client;
+    both are wrapped at the transport so every API call is covered.
+    """
+    session = getattr(getattr(client, '_server', None), '_session', None)
+    if session is None:
+        return False
+    
+    if hasattr(session, 'mount'):
+        from requests.adapters import HTTPAdapter
+        
+        class GzipAdapter(HTTPAdapter):
+            def send(self, request, **kwargs):
+                compressed = _gzip_body(request.body, request.headers, min_bytes)
+                if compressed is not None:
+                    request.body = compressed
+                    request.headers['Content-Encoding'] = 'gzip'
+                    request.headers['Content-Length'] = str(len(compressed))
+                return super().send(request, **kwargs)
+        
+        adapter = GzipAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return True
+    
+    transport = getattr(session, '_transport', None)
+    if transport is not None:
+        import httpx
+        
+        class GzipTransport(httpx.BaseTransport):
+            def handle_request(self, request):
+                compressed = _gzip_body(request.read(), request.headers, min_bytes)
+                if compressed is not None:
+                    headers = request.headers.copy()
+                    headers.pop('Content-Length', None)
+                    headers['Content-Encoding'] = 'gzip'
+                    request = httpx.Request(
+                        request.method, request.url,
+                        headers=headers, content=compressed, extensions=request.extensions
+                    )
+                return transport.handle_request(request)
+            
+            def close(self):
+                transport.close()
+        
+        session._transport = GzipTransport()
+        return True
+    
+    return False
+
+
+def new_vector_ids(n: int) -> List[str]:
+    """n random 128-bit ids as 32-char hex strings, from a single urandom call"""
+    raw = os.urandom(16 * n).hex()
+    return [raw[i:i + 32] for i in range(0, 32 * n, 32)]
+
 
 class VectorStore(ABC):
     
@@ -29,7 +124,10 @@ class ChromaDBStore(VectorStore):
         collection_name: str = "documents", 
         host: str = "localhost", 
         port: int = 8000,
-        embedding_dimension: Optional[int] = None
+        embedding_dimension: Optional[int] = None,
+        bulk_batch_size: int = BULK_BATCH_SIZE,
+        embedding_dtype=np.float32,
+        gzip_min_bytes: int = 0
     ):
         try:
             import chromadb
@@ -41,12 +139,33 @@ class ChromaDBStore(VectorStore):
                 settings=Settings(allow_reset=True, anonymized_telemetry=False)
             )
             
+            if gzip_min_bytes > 0:
+                if _enable_request_compression(self.client, gzip_min_bytes):
+                    logger.info(f"Gzip request compression enabled for bodies >= {gzip_min_bytes} bytes")
+                else:
+                    logger.warning("Could not hook the chromadb HTTP session, request compression disabled")
+            
             self.default_collection_name = collection_name
             self.current_collection_name = collection_name
             self.embedding_dimension = embedding_dimension
+            self.bulk_batch_size = bulk_batch_size
+            self.embedding_dtype = embedding_dtype
+            self._ndarray_embeddings = _accepts_ndarray_embeddings()
+            self.host = host
+            self.port = port
+            
+            # AsyncHttpClient instances are bound to the loop that created them, so keep one per loop
+            # Entries hold their loop strongly (a Task references it), so they live until aclose()
+            # on that loop, or until a later lookup finds the loop closed
+            self._async_lock = threading.Lock()
+            self._async_clients: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+            # Async collection handles belong to their loop's client, so they are cached per loop too
+            self._async_collections: Dict[asyncio.AbstractEventLoop, Dict[str, Any]] = {}
             
             # Initialize the default collection
             self.collection = self._get_or_create_collection(collection_name)
+            # Verified handles by name, so hot-path inserts skip get/create round-trips
+            self._collection_cache: Dict[str, Any] = {collection_name: self.collection}
             
             logger.info(f"Connected to ChromaDB at {host}:{port}, default collection: {collection_name}")
             
@@ -63,6 +182,19 @@ class ChromaDBStore(VectorStore):
             existing_collection = self.client.get_collection(name=collection_name)
             
             if self.embedding_dimension:
+                # Collections created here carry their dimension; only legacy ones need the probe
+                stamped = (existing_collection.metadata or {}).get('embedding_dimension')
+                if stamped is not None:
+                    if stamped == self.embedding_dimension:
+                        logger.info(f"Using existing collection: {collection_name}")
+                        return existing_collection
+                    logger.warning(
+                        f"Dimension mismatch detected ({stamped} != {self.embedding_dimension}), "
+                        f"recreating collection {collection_name}"
+                    )
+                    self.client.delete_collection(name=collection_name)
+                    return self._create_collection(collection_name)
+                
                 test_embedding = [0.0] * self.embedding_dimension
                 try:
                     existing_collection.add(
@@ -84,22 +216,40 @@ class ChromaDBStore(VectorStore):
         except Exception:
             return self._create_collection(collection_name)
     
+    def _get_collection(self, collection_name: str):
+        """Cached handle for the named collection, fetched (and checked) on first use"""
+        collection = self._collection_cache.get(collection_name)
+        if collection is None:
+            collection = self._collection_cache.setdefault(
+                collection_name, self._get_or_create_collection(collection_name)
+            )
+        return collection
+    
+    def clear_collection_cache(self):
+        """Forget cached collection handles, e.g. after collections were deleted behind the store"""
+        self._collection_cache.clear()
+        with self._async_lock:
+            self._async_collections.clear()
+    
     def _create_collection(self, collection_name: str):
         """Create new collection"""
         logger.info(f"Creating new collection: {collection_name}")
+        metadata = {"hnsw:space": "cosine"}
+        if self.embedding_dimension:
+            metadata["embedding_dimension"] = self.embedding_dimension
         return self.client.create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}
+            metadata=metadata
         )
     
     def set_collection(self, collection_name: str):
         """Switch to a different collection"""
         if collection_name != self.current_collection_name:
             logger.info(f"Switching from collection '{self.current_collection_name}' to '{collection_name}'")
-            self.collection = self._get_or_create_collection(collection_name)
+            self.collection = self._get_collection(collection_name)
             self.current_collection_name = collection_name
         else:
-            logger.debug(f"Already using collection: {collection_name}")
+            logger.debug("Already using collection: %s", collection_name)
     
     def use_collection(self, collection_name: str):
         """Alias for set_collection for compatibility"""
@@ -121,32 +271,37 @@ class ChromaDBStore(VectorStore):
         """Get detailed info about all collections"""
         try:
             collections = self.client.list_collections()
-            collections_info = []
+            if not collections:
+                return []
             
-            for collection in collections:
+            def info(collection) -> Dict:
                 try:
-                    count = collection.count()
-                    collections_info.append({
+                    return {
                         'collection_name': collection.name,
-                        'document_count': count,
+                        'document_count': collection.count(),
                         'status': 'active'
-                    })
+                    }
                 except Exception as e:
                     logger.warning(f"Error getting count for collection {collection.name}: {e}")
-                    collections_info.append({
+                    return {
                         'collection_name': collection.name,
                         'document_count': 0,
                         'status': 'error'
-                    })
+                    }
             
-            return collections_info
+            # One count() round-trip per collection, issued concurrently
+            with ThreadPoolExecutor(max_workers=min(COUNT_MAX_WORKERS, len(collections))) as executor:
+                return list(executor.map(info, collections))
         except Exception as e:
             logger.error(f"Failed to get collections info: {e}")
             return []
 
     def add_embedding(self, embedding: List[float], content: str, metadata: Dict[str, Any]):
         try:
-            doc_id = str(uuid.uuid4())
+            doc_id = new_vector_ids(1)[0]
+            
+            if hasattr(embedding, 'tolist'):
+                embedding = embedding.tolist()
             
             self.collection.add(
                 ids=[doc_id],
@@ -155,7 +310,7 @@ class ChromaDBStore(VectorStore):
                 metadatas=[metadata]
             )
             
-            logger.debug(f"Added embedding {doc_id} with dimension {len(embedding)}")
+            logger.debug("Added embedding %s with dimension %d", doc_id, len(embedding))
             
         except Exception as e:
             logger.error(f"Failed to add embedding: {e}")
@@ -164,7 +319,8 @@ class ChromaDBStore(VectorStore):
     def add_embeddings_bulk(self, vectors_data: List[Dict[str, Any]]):
         """
         PERFORMANCE FIX: Bulk insert vectors instead of one-by-one
-        Uses the current active collection
+        Vectors are grouped by their metadata's 'vector_collection_name'
+        (default: the current collection) and each group is added in one pass
         
         Args:
             vectors_data: List of dicts with 'embedding', 'content', 'metadata'
@@ -172,32 +328,177 @@ class ChromaDBStore(VectorStore):
         if not vectors_data:
             return
         
+        buckets = defaultdict(list)
+        for v in vectors_data:
+            buckets[v.get('metadata', {}).get('vector_collection_name') or self.current_collection_name].append(v)
+        
+        for target, vectors in buckets.items():
+            try:
+                self._add_to_collection(self._get_collection(target), vectors)
+                
+                logger.info(f"Bulk added {len(vectors)} embeddings to collection '{target}'")
+                
+            except Exception as e:
+                self._collection_cache.pop(target, None)
+                logger.error(f"Failed to bulk add embeddings to collection '{target}': {e}")
+                raise
+    
+    def add_embeddings_bulk_to(self, collection_name: str, vectors_data: List[Dict[str, Any]]):
+        """
+        Bulk insert into the named collection without switching the current one,
+        so inserts into different collections can run concurrently
+        """
+        if not vectors_data:
+            return
+        
         try:
-            # Check if we need to switch collections based on metadata
-            collection_name = None
-            if vectors_data and 'metadata' in vectors_data[0]:
-                collection_name = vectors_data[0]['metadata'].get('vector_collection_name')
-                if collection_name and collection_name != self.current_collection_name:
-                    self.set_collection(collection_name)
-            
-            ids = [str(uuid.uuid4()) for _ in vectors_data]
-            embeddings = [v['embedding'] for v in vectors_data]
-            documents = [v['content'] for v in vectors_data]
-            metadatas = [v['metadata'] for v in vectors_data]
+            self._add_to_collection(self._get_collection(collection_name), vectors_data)
             
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
+            logger.info(f"Bulk added {len(vectors_data)} embeddings to collection '{collection_name}'")
             
-            logger.info(f"Bulk added {len(vectors_data)} embeddings to collection '{self.current_collection_name}'")
+        except Exception as e:
+            self._collection_cache.pop(collection_name, None)
+            logger.error(f"Failed to bulk add embeddings to collection '{collection_name}': {e}")
+            raise
+    
+    async def aadd_embeddings_bulk_to(self, collection_name: str, vectors_data: List[Dict[str, Any]]):
+        """
+        Bulk insert into the named collection over AsyncHttpClient, sending
+        sub-batches concurrently (at most ASYNC_MAX_IN_FLIGHT at a time)
+        """
+        if not vectors_data:
+            return
+        
+        client = await self._get_async_client()
+        if client is None:
+            await asyncio.to_thread(self.add_embeddings_bulk_to, collection_name, vectors_data)
+            return
+        
+        try:
+            # Creation and the dimension check stay on the sync path, once per collection
+            if collection_name not in self._collection_cache:
+                await asyncio.to_thread(self._get_collection, collection_name)
+            with self._async_lock:
+                handles = self._async_collections.setdefault(asyncio.get_running_loop(), {})
+            collection = handles.get(collection_name)
+            if collection is None:
+                collection = handles[collection_name] = await client.get_collection(name=collection_name)
+            
+            ids, embeddings, documents, metadatas = self._prepare_batch(vectors_data)
+            semaphore = asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+            size = self.bulk_batch_size
+            
+            # Concurrent sub-batches commit independently; stable ids make the retry an overwrite
+            async def add(i: int):
+                async with semaphore:
+                    await collection.upsert(
+                        ids=ids[i:i + size],
+                        embeddings=self._embeddings_payload(embeddings[i:i + size]),
+                        documents=documents[i:i + size],
+                        metadatas=metadatas[i:i + size]
+                    )
+            
+            await asyncio.gather(*[add(i) for i in range(0, len(ids), size)])
+            
+            logger.info(f"Bulk added {len(vectors_data)} embeddings to collection '{collection_name}'")
             
         except Exception as e:
-            logger.error(f"Failed to bulk add embeddings to collection '{self.current_collection_name}': {e}")
+            self._collection_cache.pop(collection_name, None)
+            with self._async_lock:
+                self._async_collections.get(asyncio.get_running_loop(), {}).pop(collection_name, None)
+            logger.error(f"Failed to bulk add embeddings to collection '{collection_name}': {e}")
             raise
     
+    async def _get_async_client(self):
+        """AsyncHttpClient bound to the running loop, or None if this chromadb has none"""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            task = self._async_clients.get(loop)
+            if task is None:
+                # Loops that ended without aclose() took their connections down with them
+                for dead in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[dead]
+                    self._async_collections.pop(dead, None)
+                task = loop.create_task(self._create_async_client())
+                self._async_clients[loop] = task
+        return await task
+    
+    async def _create_async_client(self):
+        try:
+            import chromadb
+            from chromadb.config import Settings
+            
+            client = await chromadb.AsyncHttpClient(
+                host=self.host,
+                port=self.port,
+                settings=Settings(allow_reset=True, anonymized_telemetry=False)
+            )
+            logger.info(f"Created async ChromaDB client for {self.host}:{self.port}")
+            return client
+        except (ImportError, AttributeError):
+            logger.warning("chromadb AsyncHttpClient not available, bulk inserts use the sync client. Install: pip install 'chromadb>=0.5'")
+        except Exception as e:
+            logger.warning(f"Failed to create async ChromaDB client, using the sync client: {e}")
+        return None
+    
+    async def aclose(self):
+        """Close the async client bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            task = self._async_clients.pop(loop, None)
+            self._async_collections.pop(loop, None)
+        if task is None:
+            return
+        try:
+            client = await task
+            if client is not None:
+                await self._close_async_client(client)
+        except Exception as e:
+            logger.warning(f"Failed to close async ChromaDB client: {e}")
+    
+    @staticmethod
+    async def _close_async_client(client):
+        # AsyncFastAPI keeps one httpx.AsyncClient per loop id in _clients; close only this loop's
+        server = getattr(client, '_server', None)
+        pools = getattr(server, '_clients', None)
+        if isinstance(pools, dict):
+            pool = pools.pop(id(asyncio.get_running_loop()), None)
+            if pool is not None:
+                await pool.aclose()
+            return
+        cleanup = getattr(server, '_cleanup', None)
+        if cleanup is not None:
+            await cleanup()
+    
+    def _prepare_batch(self, vectors_data: List[Dict[str, Any]]) -> Tuple[List, List, List, List]:
+        ids = [v.get('id') for v in vectors_data]
+        missing = [i for i, vector_id in enumerate(ids) if vector_id is None]
+        for i, vector_id in zip(missing, new_vector_ids(len(missing))):
+            # Pin the id on the vector so a retried insert upserts the same rows
+            ids[i] = vectors_data[i]['id'] = vector_id
+        # One contiguous (n, dim) matrix instead of n lists of boxed floats
+        embeddings = np.asarray([v['embedding'] for v in vectors_data], dtype=self.embedding_dtype)
+        documents = [v['content'] for v in vectors_data]
+        metadatas = [v['metadata'] for v in vectors_data]
+        return ids, embeddings, documents, metadatas
+    
+    def _add_to_collection(self, collection, vectors_data: List[Dict[str, Any]]):
+        ids, embeddings, documents, metadatas = self._prepare_batch(vectors_data)
+        
+        # Sub-batches commit independently; upserting stable ids makes a retry after
+        # a partial failure overwrite the committed rows instead of duplicating them
+        size = self.bulk_batch_size
+        for i in range(0, len(ids), size):
+            collection.upsert(
+                ids=ids[i:i + size],
+                embeddings=self._embeddings_payload(embeddings[i:i + size]),
+                documents=documents[i:i + size],
+                metadatas=metadatas[i:i + size]
+            )
+    
+    def _embeddings_payload(self, embeddings: np.ndarray):
+        return embeddings if self._ndarray_embeddings else embeddings.tolist()
+    
     def get_stats(self) -> Dict[str, Any]:
         try:
             count = self.collection.count()
@@ -213,13 +514,17 @@ class ChromaDBStore(VectorStore):
 
 class VectorStoreFactory:
     
+    STORES = {
+        'chromadb': ChromaDBStore
+    }
+    
+    @staticmethod
+    def get_class(store_type: str) -> type:
+        try:
+            return VectorStoreFactory.STORES[store_type.lower()]
+        except KeyError:
+            raise ValueError(f"Unsupported store type: {store_type}")
+    
     @staticmethod
     def create(store_type: str, **kwargs) -> VectorStore:
-        if store_type.lower() == 'chromadb':
-            collection_name = kwargs.get('collection_name', 'documents')
-            host = kwargs.get('host', 'localhost')
-            port = kwargs.get('port', 8000)
-            embedding_dimension = kwargs.get('embedding_dimension')
-            return ChromaDBStore(collection_name, host, port, embedding_dimension)
-        
-        raise ValueError(f"Unsupported store type: {store_type}")
+        return VectorStoreFactory.get_class(store_type)(**kwargs)
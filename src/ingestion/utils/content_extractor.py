@@ -1,9 +1,56 @@
+import functools
+import importlib
 import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
+PREVIEW_CACHE_SIZE = 4096
+TEXT_PREVIEW_READ_BYTES = 8192
+
+# A non-blank line without its surrounding whitespace
+_NONBLANK_LINE = re.compile(r'\S[^\n]*\S|\S')
+
+_preview_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_preview_cache_lock = threading.Lock()
+
+
+def _memoize_preview(func):
+    """
+    LRU-cache a preview helper by file identity (path, mtime, size) and max_lines,
+    so an edited file is re-read while repeated previews of the same file are free
+    """
+    @functools.wraps(func)
+    def wrapper(file_path: str, max_lines: int) -> str:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return func(file_path, max_lines)
+        
+        key = (func.__name__, os.path.abspath(file_path), st.st_mtime_ns, st.st_size, max_lines)
+        with _preview_cache_lock:
+            if key in _preview_cache:
+                _preview_cache.move_to_end(key)
+                return _preview_cache[key]
+        
+        preview = func(file_path, max_lines)
+        # Empty previews may come from transient read errors, so they are not cached
+        if preview:
+            with _preview_cache_lock:
+                _preview_cache[key] = preview
+                if len(_preview_cache) > PREVIEW_CACHE_SIZE:
+                    _preview_cache.popitem(last=False)
+        return preview
+    
+    return wrapper
+
 
 def extract_document_preview(file_path: str, max_lines: int = 5) -> str:
     """
@@ -34,9 +81,47 @@ def extract_document_preview(file_path: str, max_lines: int = 5) -> str:
         return ""
 
 
+def batch_extract_previews(paths: Iterable[str], max_lines: int = 5, workers: Optional[int] = None) -> List[str]:
+    """
+    Extract previews for many files in parallel worker processes.
+    
+    PDF/DOCX parsing is pure-Python and GIL-bound, so processes (not threads)
+    scale it across cores.
+    
+    Args:
+        paths: Paths to documents
+        max_lines: Maximum number of lines per preview
+        workers: Worker processes (default: CPU count)
+        
+    Returns:
+        Previews in the same order as paths
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return [extract_document_preview(path, max_lines) for path in paths]
+    
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            functools.partial(extract_document_preview, max_lines=max_lines),
+            paths,
+            chunksize=16
+        ))
+
+
+@_memoize_preview
 def _extract_text_preview(file_path: str, max_lines: int) -> str:
     """Extract preview from text files"""
     try:
+        # One read and one decode cover the first lines of almost every file
+        with open(file_path, 'rb') as f:
+            data = f.read(TEXT_PREVIEW_READ_BYTES)
+        # Same newline handling as text mode
+        head = data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        # The last piece may be cut off mid-line unless the whole file was read
+        if len(head) > max_lines or len(data) < TEXT_PREVIEW_READ_BYTES:
+            return '\n'.join(line.strip() for line in head[:max_lines] if line.strip())
+        
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             lines = []
             for _ in range(max_lines):
@@ -52,29 +137,69 @@ def _extract_text_preview(file_path: str, max_lines: int) -> str:
         return ""
 
 
+@functools.lru_cache(maxsize=None)
+def _optional_import(module_name: str, attr: Optional[str] = None):
+    """Import an optional extraction dependency once; None if it is not installed"""
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+    return getattr(module, attr) if attr else module
+
+
+@_memoize_preview
 def _extract_pdf_preview(file_path: str, max_lines: int) -> str:
     """Extract preview from PDF files"""
     try:
-        import PyPDF2
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            if len(reader.pages) > 0:
-                text = reader.pages[0].extract_text()
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                return '\n'.join(lines[:max_lines])
-        return ""
+        return _first_lines(_pdf_first_page_text(file_path), max_lines)
     except ImportError:
-        logger.warning("PyPDF2 not installed, cannot extract PDF preview")
+        logger.warning("pypdf not installed, cannot extract PDF preview")
         return ""
     except Exception as e:
         logger.error(f"Error extracting PDF preview: {e}")
         return ""
 
 
+def _first_lines(text: str, max_lines: int) -> str:
+    """First max_lines non-blank lines, stripped, in one regex scan that stops early"""
+    return '\n'.join(m.group() for m in islice(_NONBLANK_LINE.finditer(text), max_lines))
+
+
+def _pdf_first_page_text(file_path: str) -> str:
+    """Text of the first page; pdfium loads only that page, pypdf is the fallback"""
+    pdfium = _optional_import('pypdfium2')
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            if len(pdf) == 0:
+                return ""
+            page = pdf[0]
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    
+    PdfReader = _optional_import('pypdf', 'PdfReader')
+    if PdfReader is None:
+        raise ImportError("pypdf")
+    with open(file_path, 'rb') as f:
+        reader = PdfReader(f, strict=False)
+        if len(reader.pages) > 0:
+            return reader.pages[0].extract_text() or ""
+    return ""
+
+
+@_memoize_preview
 def _extract_docx_preview(file_path: str, max_lines: int) -> str:
     """Extract preview from DOCX files"""
     try:
-        from docx import Document
+        Document = _optional_import('docx', 'Document')
+        if Document is None:
+            raise ImportError("python-docx")
         doc = Document(file_path)
         lines = []
         for para in doc.paragraphs:
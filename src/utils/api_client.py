@@ -1,51 +1,95 @@
+import asyncio
 import requests
 import json
 import time
 import logging
-from typing import Dict, Any, Optional
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+AIO_MAX_CONCURRENCY = 16
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _loads(data) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _epoch_seconds(value: Any) -> Optional[float]:
+    """Step Functions timestamps arrive as epoch seconds or ISO-8601 strings"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        # fromisoformat only accepts a 'Z' suffix from Python 3.11
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
 class DocQAAPIClient:
     def __init__(self, api_endpoint: str, api_key: str, state_machine_arn: str):
         self.api_endpoint = api_endpoint
         self.api_key = api_key
         self.state_machine_arn = state_machine_arn
+        # Everything in the StartSyncExecution body before the per-query input is fixed
+        self._payload_prefix = _dumps({"stateMachineArn": state_machine_arn})[:-1] + b',"input":'
         self.headers = {
             "Content-Type": "application/json",
             "x-api-key": api_key
         }
+        
+        # Pooled keep-alive connections, so repeated queries skip the TCP/TLS handshake.
+        # Retry keeps urllib3's default idempotent-method list, so a POST is only retried
+        # when the request never reached the server.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
     
     def invoke_agent(self, query: str, timeout: int = 30) -> Dict[str, Any]:
         """
         Invoke the DocQA agent orchestrator via Step Functions API
         """
-        payload = {
-            "stateMachineArn": self.state_machine_arn,
-            "input": json.dumps({"query": query})
-        }
+        payload = self._build_payload(query)
         
         try:
             logger.info(f"Invoking DocQA API with query: {query[:100]}...")
             
-            response = requests.post(
+            response = self._session.post(
                 self.api_endpoint,
-                headers=self.headers,
-                json=payload,
+                data=payload,
                 timeout=timeout
             )
             
             if response.status_code == 200:
-                result = response.json()
-                
-                # Parse the output from Step Functions
-                if 'output' in result:
-                    output_data = json.loads(result['output'])
-                    return self._parse_agent_response(output_data, result)
-                else:
-                    logger.error(f"No output in API response: {result}")
-                    return self._create_error_response("No output received from API")
-                    
+                return self._handle_result(_loads(response.content))
             else:
                 logger.error(f"API call failed with status {response.status_code}: {response.text}")
                 return self._create_error_response(f"API call failed: {response.status_code}")
@@ -66,6 +110,97 @@ class DocQAAPIClient:
             logger.error(f"Unexpected error: {e}")
             return self._create_error_response(f"Unexpected error: {str(e)}")
     
+    async def ainvoke_agent(self, query: str, timeout: int = 30, session=None) -> Dict[str, Any]:
+        """
+        Async variant of invoke_agent over aiohttp, for issuing many queries concurrently.
+        Pass an open aiohttp.ClientSession to reuse its connections; otherwise one is
+        opened and closed around this call.
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            logger.warning("aiohttp not installed, running invoke_agent in a worker thread. Install: pip install aiohttp")
+            return await asyncio.to_thread(self.invoke_agent, query, timeout)
+        
+        if session is None:
+            async with aiohttp.ClientSession(headers=self.headers) as session:
+                return await self._apost(aiohttp, session, query, timeout)
+        return await self._apost(aiohttp, session, query, timeout)
+    
+    async def _apost(self, aiohttp, session, query: str, timeout: int) -> Dict[str, Any]:
+        payload = self._build_payload(query)
+        
+        try:
+            logger.info(f"Invoking DocQA API (async) with query: {query[:100]}...")
+            
+            async with session.post(
+                self.api_endpoint,
+                data=payload,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 200:
+                    return self._handle_result(_loads(await response.read()))
+                
+                text = await response.text()
+                logger.error(f"API call failed with status {response.status}: {text}")
+                return self._create_error_response(f"API call failed: {response.status}")
+                
+        except asyncio.TimeoutError:
+            logger.error("API request timed out")
+            return self._create_error_response("Request timed out. Please try again.")
+            
+        except aiohttp.ClientError as e:
+            logger.error(f"API request failed: {e}")
+            return self._create_error_response(f"Network error: {str(e)}")
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse API response: {e}")
+            return self._create_error_response("Invalid response format")
+            
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return self._create_error_response(f"Unexpected error: {str(e)}")
+    
+    async def ainvoke_many(self, queries: List[str], timeout: int = 30, max_concurrency: int = AIO_MAX_CONCURRENCY) -> List[Dict[str, Any]]:
+        """
+        Run several queries concurrently (at most max_concurrency in flight) over one
+        aiohttp session, closed when they finish; results keep query order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(query: str, session=None) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.ainvoke_agent(query, timeout, session)
+        
+        try:
+            import aiohttp
+        except ImportError:
+            return await asyncio.gather(*[run(query) for query in queries])
+        
+        async with aiohttp.ClientSession(headers=self.headers) as session:
+            return await asyncio.gather(*[run(query, session) for query in queries])
+    
+    def _build_payload(self, query: str) -> bytes:
+        """
+        Step Functions StartSyncExecution body, serialized once to bytes
+        
+        'input' must be a JSON string, so the query is encoded, the result quoted as
+        a string, and spliced after the precomputed prefix; the outer dict is never re-encoded.
+        """
+        return self._payload_prefix + _dumps(_dumps({"query": query}).decode('utf-8')) + b'}'
+    
+    def _handle_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a Step Functions sync-execution result into an agent response
+        """
+        # Parse the output from Step Functions
+        if 'output' in result:
+            output_data = _loads(result['output'])
+            return self._parse_agent_response(output_data, result)
+        else:
+            logger.error(f"No output in API response: {result}")
+            return self._create_error_response("No output received from API")
+    
     def _parse_agent_response(self, output_data: Dict[str, Any], raw_response: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse the agent response from Step Functions output
@@ -80,10 +215,13 @@ class DocQAAPIClient:
             
             # Extract execution metadata
             execution_time = 0
-            if 'startDate' in raw_response and 'stopDate' in raw_response:
-                execution_time = (raw_response['stopDate'] - raw_response['startDate']) * 1000
+            start = _epoch_seconds(raw_response.get('startDate'))
+            stop = _epoch_seconds(raw_response.get('stopDate'))
+            if start is not None and stop is not None:
+                execution_time = (stop - start) * 1000
             
-            billing_duration = raw_response.get('billingDetails', {}).get('billedDurationInMilliseconds', 0)
+            billing = raw_response.get('billingDetails') or {}
+            billing_duration = billing.get('billedDurationInMilliseconds', 0)
             
             return {
                 'success': True,
@@ -116,13 +254,23 @@ class DocQAAPIClient:
             'error': message
         }
     
-    def health_check(self) -> bool:
+    def close(self):
+        """Release pooled connections"""
+        self._session.close()
+    
+    def health_check(self, deep_check: bool = False) -> bool:
         """
-        Perform a simple health check with a greeting query
+        Check the API is reachable with a HEAD request; any non-5xx status counts,
+        since the gateway may reject HEAD itself (403/405) while being up.
+        deep_check=True runs a full agent query with a greeting instead.
         """
         try:
-            response = self.invoke_agent("hello", timeout=10)
-            return response.get('success', False)
+            if deep_check:
+                response = self.invoke_agent("hello", timeout=10)
+                return response.get('success', False)
+            
+            response = self._session.head(self.api_endpoint, timeout=3, allow_redirects=False)
+            return response.status_code < 500
         except Exception:
             return False
 
@@ -132,6 +280,8 @@ class APIClientManager:
     """
     _instance = None
     _client = None
+    _last_config = None
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -142,17 +292,22 @@ class APIClientManager:
         """
         Get or create an API client instance
         """
-        if self._client is None or self._needs_refresh(api_endpoint, api_key, state_machine_arn):
-            self._client = DocQAAPIClient(api_endpoint, api_key, state_machine_arn)
-            self._last_config = (api_endpoint, api_key, state_machine_arn)
+        client = self._client
+        if client is not None and not self._needs_refresh(api_endpoint, api_key, state_machine_arn):
+            return client
         
-        return self._client
+        with self._lock:
+            # Re-check: another thread may have built the client while we waited
+            if self._client is None or self._needs_refresh(api_endpoint, api_key, state_machine_arn):
+                if self._client is not None:
+                    self._client.close()
+                self._client = DocQAAPIClient(api_endpoint, api_key, state_machine_arn)
+                self._last_config = (api_endpoint, api_key, state_machine_arn)
+            
+            return self._client
     
     def _needs_refresh(self, api_endpoint: str, api_key: str, state_machine_arn: str) -> bool:
         """
         Check if client needs to be refreshed due to config changes
         """
-        if not hasattr(self, '_last_config'):
-            return True
-        
         return self._last_config != (api_endpoint, api_key, state_machine_arn)